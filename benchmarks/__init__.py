@@ -0,0 +1 @@
+"""Benchmarks for stavroslib (run from the repository root)."""
@@ -0,0 +1,269 @@
+"""Shared benchmark runner, baseline storage and regression check."""
+
+import argparse
+import cProfile
+import json
+import platform
+import re
+import subprocess
+import sys
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+BASELINE_DIR = Path(__file__).parent / ".baselines"
+
+
+@dataclass(frozen=True)
+class Case:
+    """One benchmark case.
+
+    Attributes:
+        name: Unique case name, e.g. "exact_binomial_probability[n=1000]".
+        setup: Builds the inputs and returns a zero-argument callable to time.
+        tier: "quick" cases always run; "full" cases only with --full.
+        input_bytes: Size of the input processed per call; when set, the
+            throughput is reported next to the time.
+    """
+
+    name: str
+    setup: Callable[[], Callable[[], Any]]
+    tier: str = "quick"
+    input_bytes: int = 0
+
+
+def time_case(case: Case, repeat: int) -> float:
+    """Return the best time per call, in seconds, over ``repeat`` rounds."""
+    func = case.setup()
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def load_baselines(path: Path) -> dict[str, float]:
+    """Load recorded baselines (case name -> seconds per call)."""
+    if not path.exists():
+        return {}
+    data: dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    return {name: float(seconds) for name, seconds in data["cases"].items()}
+
+
+def save_baselines(path: Path, results: dict[str, float]) -> None:
+    """Merge results into the baseline file."""
+    cases = load_baselines(path)
+    cases.update(results)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cases": dict(sorted(cases.items())),
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def find_regressions(
+    results: dict[str, float], baselines: dict[str, float], threshold: float
+) -> list[tuple[str, float]]:
+    """Return (case name, slowdown ratio) for cases slower than threshold."""
+    regressions = []
+    for name, seconds in results.items():
+        baseline = baselines.get(name)
+        if baseline and seconds / baseline > threshold:
+            regressions.append((name, seconds / baseline))
+    return regressions
+
+
+def measure_peak_rss(case: Case) -> dict[str, int]:
+    """Run a case once and return the process RSS high-water mark in bytes.
+
+    Only meaningful in a fresh process (see peak_rss_in_subprocess): the
+    high-water mark never goes down, so "setup" is the peak after building
+    the inputs and "peak" the peak after one call.
+    """
+    func = case.setup()
+    setup = _rss_high_water_mark()
+    func()
+    return {"setup": setup, "peak": _rss_high_water_mark()}
+
+
+def _rss_high_water_mark() -> int:
+    """Peak resident set size of this process, in bytes."""
+    try:
+        # Linux: VmHWM belongs to the address space, which exec replaces,
+        # whereas ru_maxrss is inherited from the parent across fork/exec
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource  # Unix only
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def peak_rss_in_subprocess(case: Case) -> dict[str, int]:
+    """Measure a case with measure_peak_rss in a fresh interpreter.
+
+    The suite is re-run with the hidden --child-memory option, so the
+    measurement is not inflated by earlier cases.
+    """
+    main_module = sys.modules["__main__"]
+    spec = getattr(main_module, "__spec__", None)
+    if spec is not None:
+        command = [sys.executable, "-m", spec.name]
+    else:
+        command = [sys.executable, str(main_module.__file__)]
+    completed = subprocess.run(
+        command + ["--child-memory", case.name],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result: dict[str, int] = json.loads(completed.stdout.splitlines()[-1])
+    return result
+
+
+def profile_case(case: Case, directory: Path) -> Path:
+    """Run a case once under cProfile and dump the stats (for pstats/snakeviz)."""
+    func = case.setup()
+    path = directory / f"{_file_name(case.name)}.prof"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profiler = cProfile.Profile()
+    profiler.runcall(func)
+    profiler.dump_stats(path)
+    return path
+
+
+def trace_allocations(case: Case, directory: Path, limit: int = 25) -> Path:
+    """Run a case once under tracemalloc and write the top allocation sites."""
+    func = case.setup()
+    path = directory / f"{_file_name(case.name)}.tracemalloc.txt"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tracemalloc.start()
+    try:
+        # Keep the result alive so the snapshot shows what it holds
+        result = func()
+        snapshot = tracemalloc.take_snapshot()
+        held, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    lines = [
+        f"{case.name}: peak traced memory {peak / 2**20:.1f} MiB,"
+        f" {held / 2**20:.1f} MiB held by the result",
+        "",
+    ]
+    lines += [str(stat) for stat in snapshot.statistics("lineno")[:limit]]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def _file_name(case_name: str) -> str:
+    return re.sub(r"[^\w.=-]+", "_", case_name).strip("_")
+
+
+def _format_bytes(size: float) -> str:
+    for unit, scale in (("GiB", 2**30), ("MiB", 2**20), ("KiB", 2**10)):
+        if size >= scale:
+            return f"{size / scale:8.1f} {unit}"
+    return f"{size:8.0f} B"
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def main(suite: str, cases: Sequence[Case], argv: Sequence[str] | None = None) -> int:
+    """Run a benchmark suite from the command line.
+
+    Arguments:
+        suite: Suite name, used for the default baseline file.
+        cases: Benchmark cases of the suite.
+        argv: Command line arguments (default: sys.argv[1:]).
+
+    Returns:
+        Process exit code: 1 if any case regressed past the threshold.
+    """
+    parser = argparse.ArgumentParser(description=f"Benchmark {suite}")
+    parser.add_argument("--full", action="store_true", help="include large sizes")
+    parser.add_argument("-k", dest="pattern", default="", help="run matching cases")
+    parser.add_argument("--repeat", type=int, default=3, help="timing rounds")
+    parser.add_argument(
+        "--record", action="store_true", help="save results as the new baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.5,
+        help="flag cases slower than baseline by this factor (default: 1.5)",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=BASELINE_DIR / f"{suite}.json",
+        help="baseline file",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="also report peak RSS, measured in a fresh process per case",
+    )
+    parser.add_argument(
+        "--profile", type=Path, metavar="DIR", help="write cProfile stats to DIR"
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        type=Path,
+        metavar="DIR",
+        help="write the top allocation sites to DIR",
+    )
+    parser.add_argument("--child-memory", metavar="CASE", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child_memory:
+        (case,) = [case for case in cases if case.name == args.child_memory]
+        print(json.dumps(measure_peak_rss(case)))
+        return 0
+
+    selected = [
+        case
+        for case in cases
+        if (args.full or case.tier == "quick") and args.pattern in case.name
+    ]
+    baselines = load_baselines(args.baseline)
+    results: dict[str, float] = {}
+    for case in selected:
+        seconds = time_case(case, args.repeat)
+        results[case.name] = seconds
+        line = f"{case.name:<60} {_format_seconds(seconds)}"
+        if case.input_bytes:
+            line += f"  {_format_bytes(case.input_bytes / seconds)}/s"
+        if case.name in baselines:
+            line += f"  x{seconds / baselines[case.name]:.2f} vs baseline"
+        if args.memory:
+            rss = peak_rss_in_subprocess(case)
+            line += f"  peak RSS {_format_bytes(rss['peak'])}"
+            line += f" (+{_format_bytes(rss['peak'] - rss['setup']).strip()})"
+        print(line, flush=True)
+        if args.profile:
+            print(f"  cProfile: {profile_case(case, args.profile)}")
+        if args.tracemalloc:
+            print(f"  tracemalloc: {trace_allocations(case, args.tracemalloc)}")
+
+    if args.record:
+        save_baselines(args.baseline, results)
+        print(f"Recorded {len(results)} baselines in {args.baseline}")
+        return 0
+
+    regressions = find_regressions(results, baselines, args.threshold)
+    for name, ratio in regressions:
+        print(f"REGRESSION {name}: {ratio:.2f}x slower than baseline", file=sys.stderr)
+    return 1 if regressions else 0
@@ -0,0 +1,158 @@
+"""Benchmarks for stavroslib.probability and the modules built on it.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_probability --record   # save baselines
+    python -m benchmarks.bench_probability            # compare to baselines
+    python -m benchmarks.bench_probability --full     # include large sizes
+"""
+
+import random
+import sys
+from fractions import Fraction
+from functools import partial
+from typing import Any, Callable
+
+from benchmarks._harness import Case, main
+from stavroslib.accumulators import RunningBinomialTest
+from stavroslib.probability import (
+    convert_dec_to_prob,
+    convert_frac_to_dec,
+    convert_frac_to_prob,
+    convert_prob_to_dec,
+    cumulative_binomial_probabilities,
+    exact_binomial_probability,
+    remove_overround_markets,
+)
+from stavroslib.simulation import final_summary, simulate_binomial
+
+
+def _tier(size: int, full_from: int) -> str:
+    return "full" if size >= full_from else "quick"
+
+
+def _conversions(size: int) -> Callable[[], Any]:
+    rng = random.Random(0)
+    odds = [rng.uniform(1.01, 50.0) for _ in range(size)]
+    probs = [1 / o for o in odds]
+    fracs = [(rng.randint(1, 20), rng.randint(1, 20)) for _ in range(size)]
+
+    def run() -> None:
+        for o in odds:
+            convert_dec_to_prob(o)
+        for p in probs:
+            convert_prob_to_dec(p)
+        for nom, denom in fracs:
+            convert_frac_to_prob(nom, denom)
+            convert_frac_to_dec(nom, denom)
+
+    return run
+
+
+def _binomial(n: int) -> Callable[[], Any]:
+    return lambda: exact_binomial_probability(n, n * 3 // 10, 0.3)
+
+
+def _cumulative(n: int) -> Callable[[], Any]:
+    return lambda: cumulative_binomial_probabilities(n, n // 3, 0.3)
+
+
+def _cumulative_exact(n: int) -> Callable[[], Any]:
+    return lambda: cumulative_binomial_probabilities(
+        n, n // 3, Fraction(3, 10), exact=True
+    )
+
+
+def _markets(size: int, method: str) -> Callable[[], Any]:
+    rng = random.Random(0)
+    books = []
+    for _ in range(size):
+        probs = [rng.random() + 0.1 for _ in range(3)]
+        total = sum(probs) / 1.05  # 5% overround
+        books.append([total / p for p in probs])
+    return lambda: remove_overround_markets(books, method)
+
+
+def _running_test(size: int) -> Callable[[], Any]:
+    rng = random.Random(0)
+    outcomes = [rng.random() < 0.55 for _ in range(size)]
+
+    def run() -> None:
+        test = RunningBinomialTest(0.5)
+        for outcome in outcomes:
+            test.update(outcome)
+
+    return run
+
+
+def _simulation(size: int) -> Callable[[], Any]:
+    return lambda: final_summary(
+        simulate_binomial(1_000, 0.3, size, batch_size=size, seed=0)
+    )
+
+
+def build_cases() -> list[Case]:
+    """Build every benchmark case of the probability suite."""
+    cases = []
+    for size in (1_000, 100_000, 10_000_000):
+        cases.append(
+            Case(
+                f"odds_conversions[batch={size}]",
+                partial(_conversions, size),
+                _tier(size, 1_000_000),
+            )
+        )
+    for n in (10, 1_000, 100_000, 1_000_000):
+        cases.append(
+            Case(
+                f"exact_binomial_probability[n={n}]",
+                partial(_binomial, n),
+                _tier(n, 1_000_000),
+            )
+        )
+    # The terms come from a ratio recurrence, so the cost is linear in n
+    for n in (10, 100, 1_000, 100_000, 1_000_000):
+        cases.append(
+            Case(
+                f"cumulative_binomial_probabilities[n={n}]",
+                partial(_cumulative, n),
+                _tier(n, 1_000_000),
+            )
+        )
+    for n in (10, 100, 1_000):
+        cases.append(
+            Case(
+                f"cumulative_binomial_probabilities[exact,n={n}]",
+                partial(_cumulative_exact, n),
+                _tier(n, 1_000),
+            )
+        )
+    for method in ("proportional", "shin", "power"):
+        for size in (100, 10_000, 1_000_000):
+            cases.append(
+                Case(
+                    f"remove_overround_markets[{method},markets={size}]",
+                    partial(_markets, size, method),
+                    _tier(size, 1_000_000),
+                )
+            )
+    for size in (10_000, 1_000_000):
+        cases.append(
+            Case(
+                f"RunningBinomialTest.update[events={size}]",
+                partial(_running_test, size),
+                _tier(size, 1_000_000),
+            )
+        )
+    for size in (100_000, 10_000_000):
+        cases.append(
+            Case(
+                f"simulate_binomial[n=1000,batch={size}]",
+                partial(_simulation, size),
+                _tier(size, 1_000_000),
+            )
+        )
+    return cases
+
+
+if __name__ == "__main__":
+    sys.exit(main("probability", build_cases()))
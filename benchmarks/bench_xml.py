@@ -0,0 +1,171 @@
+"""Benchmarks for stavroslib.xml on synthetic documents.
+
+Documents of four shapes are generated once and kept (git-ignored) under
+benchmarks/.data/, since the largest ones take a while to write:
+
+    deep        records nested 50 elements deep
+    wide        many small sibling records
+    attributes  records carrying 20 attributes each
+    namespaces  prefixed and default namespaces on elements and attributes
+
+Usage (from the repository root):
+    python -m benchmarks.bench_xml --record            # save baselines
+    python -m benchmarks.bench_xml --memory            # add peak RSS per case
+    python -m benchmarks.bench_xml -k wide --profile prof/ --tracemalloc prof/
+    python -m benchmarks.bench_xml --full              # 100 MB and 1 GB documents
+"""
+
+import os
+import sys
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from benchmarks._harness import Case, main
+from stavroslib.xml import iter_xml_records, remove_namespace, xml_to_dict
+
+DATA_DIR = Path(__file__).parent / ".data"
+
+SIZES = {"1KB": 2**10, "1MB": 2**20, "100MB": 100 * 2**20, "1GB": 2**30}
+
+_DEPTH = 50
+_NAMESPACES = 'xmlns="urn:default" xmlns:a="urn:a" xmlns:b="urn:b" xmlns:c="urn:c"'
+
+
+def _deep(i: int) -> str:
+    return (
+        f'<record id="{i}">'
+        + "<level>" * _DEPTH
+        + str(i)
+        + "</level>" * _DEPTH
+        + "</record>"
+    )
+
+
+def _wide(i: int) -> str:
+    return (
+        f'<record id="{i}"><name>item {i}</name><value>{i * 0.5}</value>'
+        "<flag>true</flag></record>"
+    )
+
+
+def _attributes(i: int) -> str:
+    attributes = " ".join(f'a{j}="{i * j}"' for j in range(20))
+    return f'<record id="{i}" {attributes}/>'
+
+
+def _namespaces(i: int) -> str:
+    return (
+        f'<a:record b:id="{i}"><b:name>item {i}</b:name>'
+        f'<c:value c:unit="kg">{i * 0.5}</c:value><value>{i}</value></a:record>'
+    )
+
+
+# Shape -> (record generator, root attributes, record tag for streaming)
+SHAPES: dict[str, tuple[Callable[[int], str], str, str]] = {
+    "deep": (_deep, "", "record"),
+    "wide": (_wide, "", "record"),
+    "attributes": (_attributes, "", "record"),
+    "namespaces": (_namespaces, _NAMESPACES, "{urn:a}record"),
+}
+
+
+def _records(shape: str) -> Iterator[str]:
+    record, _, _ = SHAPES[shape]
+    i = 0
+    while True:
+        yield record(i)
+        i += 1
+
+
+def document(shape: str, size: int) -> Path:
+    """Return the path of a generated document, writing it if needed.
+
+    The document holds as many whole records as fit and is padded with
+    whitespace between records to exactly size bytes, so throughput can
+    be computed from the nominal size.
+    """
+    path = DATA_DIR / f"{shape}-{size}.xml"
+    if path.exists():
+        return path
+    _, root_attributes, _ = SHAPES[shape]
+    head = f'<?xml version="1.0" encoding="UTF-8"?>\n<feed {root_attributes}>'
+    tail = "</feed>\n"
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    partial_path = path.with_suffix(".partial")
+    with open(partial_path, "w", encoding="utf-8") as f:
+        f.write(head)
+        written = len(head) + len(tail)
+        buffer: list[str] = []
+        for record in _records(shape):
+            if buffer and written + len(record) > size:
+                break
+            buffer.append(record)
+            written += len(record)
+            if len(buffer) == 10_000:
+                f.write("".join(buffer))
+                buffer = []
+        f.write("".join(buffer))
+        f.write(" " * (size - written))
+        f.write(tail)
+    os.replace(partial_path, path)
+    return path
+
+
+def _xml_to_dict_path(path: Path) -> Callable[[], Any]:
+    return lambda: xml_to_dict(path, huge_tree=True)
+
+
+def _xml_to_dict_bytes(path: Path) -> Callable[[], Any]:
+    data = path.read_bytes()
+    return lambda: xml_to_dict(data, huge_tree=True)
+
+
+def _remove_namespace(path: Path, method: str) -> Callable[[], Any]:
+    data = path.read_bytes()
+    return lambda: remove_namespace(data, method)
+
+
+def _iter_xml_records(path: Path, tag: str) -> Callable[[], Any]:
+    def run() -> None:
+        for _ in iter_xml_records(path, tag, huge_tree=True):
+            pass
+
+    return run
+
+
+def _setup(
+    setup: Callable[[Path], Callable[[], Any]], shape: str, size: int
+) -> Callable[[], Any]:
+    return setup(document(shape, size))
+
+
+def build_cases() -> list[Case]:
+    """Build every benchmark case of the XML suite."""
+    cases = []
+    for shape, (_, _, tag) in SHAPES.items():
+        for label, size in SIZES.items():
+            tier = "full" if size > 2**20 else "quick"
+            modes: dict[str, Callable[[Path], Callable[[], Any]]] = {
+                "xml_to_dict[path": _xml_to_dict_path,
+                "xml_to_dict[bytes": _xml_to_dict_bytes,
+                "iter_xml_records[path": partial(_iter_xml_records, tag=tag),
+                "remove_namespace[xslt": partial(_remove_namespace, method="xslt"),
+                "remove_namespace[rewrite": partial(
+                    _remove_namespace, method="rewrite"
+                ),
+            }
+            for mode, setup in modes.items():
+                cases.append(
+                    Case(
+                        f"{mode},{shape},{label}]",
+                        partial(_setup, setup, shape, size),
+                        tier,
+                        input_bytes=size,
+                    )
+                )
+    return cases
+
+
+if __name__ == "__main__":
+    sys.exit(main("xml", build_cases()))
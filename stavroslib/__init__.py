@@ -1,22 +1,60 @@
-from stavroslib.datetime import format_datetime, parse_datetime, relative_time
-from stavroslib.dict import merge_dicts
-from stavroslib.ftp import FtpHelper, monitor_and_ftp, upload_all
-from stavroslib.misc import get_country_data, sys_not
-from stavroslib.parse import read_toml, read_yaml
-from stavroslib.pdf import (
-    arial_11_justified,
-    arial_11_right,
-    heading_1,
-    register_pdf_fonts,
-)
-from stavroslib.probability import (
-    convert_dec_to_prob,
-    convert_frac_to_dec,
-    convert_frac_to_prob,
-    convert_prob_to_dec,
-    cumulative_binomial_probabilities,
-    exact_binomial_probability,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from stavroslib.datetime import format_datetime, parse_datetime, relative_time
+    from stavroslib.dict import merge_dicts
+    from stavroslib.ftp import FtpHelper, monitor_and_ftp, upload_all
+    from stavroslib.misc import get_country_data, sys_not
+    from stavroslib.parse import read_toml, read_yaml
+    from stavroslib.pdf import (
+        arial_11_justified,
+        arial_11_right,
+        heading_1,
+        register_pdf_fonts,
+    )
+    from stavroslib.probability import (
+        book_overround,
+        convert_dec_to_prob,
+        convert_frac_to_dec,
+        convert_frac_to_prob,
+        convert_prob_to_dec,
+        cumulative_binomial_probabilities,
+        exact_binomial_probability,
+        remove_overround,
+        remove_overround_markets,
+    )
+
+# Public name -> module defining it. The modules (and their dependencies,
+# e.g. reportlab for pdf or requests for misc) are imported on first access
+# of one of their names (PEP 562), so `import stavroslib.parse` does not
+# pay for all of them.
+_EXPORTS = {
+    "format_datetime": "stavroslib.datetime",
+    "parse_datetime": "stavroslib.datetime",
+    "relative_time": "stavroslib.datetime",
+    "merge_dicts": "stavroslib.dict",
+    "FtpHelper": "stavroslib.ftp",
+    "monitor_and_ftp": "stavroslib.ftp",
+    "upload_all": "stavroslib.ftp",
+    "get_country_data": "stavroslib.misc",
+    "sys_not": "stavroslib.misc",
+    "read_toml": "stavroslib.parse",
+    "read_yaml": "stavroslib.parse",
+    "arial_11_justified": "stavroslib.pdf",
+    "arial_11_right": "stavroslib.pdf",
+    "heading_1": "stavroslib.pdf",
+    "register_pdf_fonts": "stavroslib.pdf",
+    "book_overround": "stavroslib.probability",
+    "convert_dec_to_prob": "stavroslib.probability",
+    "convert_frac_to_dec": "stavroslib.probability",
+    "convert_frac_to_prob": "stavroslib.probability",
+    "convert_prob_to_dec": "stavroslib.probability",
+    "cumulative_binomial_probabilities": "stavroslib.probability",
+    "exact_binomial_probability": "stavroslib.probability",
+    "remove_overround": "stavroslib.probability",
+    "remove_overround_markets": "stavroslib.probability",
+}
 
 __all__ = [
     "format_datetime",
@@ -34,10 +72,36 @@ __all__ = [
     "arial_11_right",
     "heading_1",
     "register_pdf_fonts",
+    "book_overround",
     "convert_dec_to_prob",
     "convert_frac_to_dec",
     "convert_frac_to_prob",
     "convert_prob_to_dec",
     "cumulative_binomial_probabilities",
     "exact_binomial_probability",
+    "remove_overround",
+    "remove_overround_markets",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is not None:
+        value = getattr(importlib.import_module(module), name)
+    else:
+        # Submodules, e.g. stavroslib.parse after a bare `import stavroslib`
+        try:
+            value = importlib.import_module(f"{__name__}.{name}")
+        except ModuleNotFoundError as exc:
+            if exc.name != f"{__name__}.{name}":
+                raise
+            raise AttributeError(
+                f"module {__name__!r} has no attribute {name!r}"
+            ) from None
+    # Cache it, so later lookups no longer go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,67 @@
+"""Process Pool Helpers (internal)"""
+
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+R = TypeVar("R")
+
+
+def resolve_workers(workers: int | None) -> int:
+    """Number of worker processes to use; None means one per CPU."""
+    if workers is None:
+        return os.cpu_count() or 1
+    return max(1, workers)
+
+
+def pool_starmap(
+    func: Callable[..., R],
+    tasks: Iterable[tuple[Any, ...]],
+    workers: int | None,
+    ordered: bool = True,
+) -> Iterator[R]:
+    """Run func(*task) for every task, yielding results as they are ready.
+
+    With one worker the tasks run in this process. Otherwise they run on a
+    ProcessPoolExecutor with at most two tasks per worker in flight, so the
+    task iterable is consumed lazily and memory stays flat however many
+    tasks there are.
+
+    Arguments:
+        func: Picklable (module-level) function to run.
+        tasks: Iterable of argument tuples.
+        workers: Number of worker processes; None uses all CPUs.
+        ordered: Yield results in task order (True) or in completion order.
+
+    Returns:
+        Iterator of results.
+    """
+    workers = resolve_workers(workers)
+    if workers == 1:
+        for task in tasks:
+            yield func(*task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if ordered:
+            queue: deque[Future[R]] = deque()
+            for task in tasks:
+                queue.append(executor.submit(func, *task))
+                if len(queue) >= 2 * workers:
+                    yield queue.popleft().result()
+            while queue:
+                yield queue.popleft().result()
+            return
+
+        pending: set[Future[R]] = set()
+        for task in tasks:
+            pending.add(executor.submit(func, *task))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
@@ -0,0 +1,195 @@
+"""Streaming (Online) Statistics Accumulators"""
+
+import math
+
+
+def _log_add_exp(a: float, b: float) -> float:
+    """Compute log(exp(a) + exp(b)) without overflow."""
+    if a == -math.inf:
+        return b
+    if b == -math.inf:
+        return a
+    high, low = (a, b) if a >= b else (b, a)
+    return high + math.log1p(math.exp(low - high))
+
+
+class HitRateCounter:
+    """Success/trial counter with O(1) updates."""
+
+    def __init__(self, successes: int = 0, trials: int = 0):
+        """Initialize the counter.
+
+        Arguments:
+            successes: Initial number of successes.
+            trials: Initial number of trials.
+        """
+        if not 0 <= successes <= trials:
+            raise ValueError("successes must be between 0 and trials")
+        self.successes = successes
+        self.trials = trials
+
+    def update(self, success: bool) -> None:
+        """Record the outcome of one trial.
+
+        Arguments:
+            success: True if the trial was a success.
+        """
+        self.trials += 1
+        if success:
+            self.successes += 1
+
+    def update_many(self, successes: int, trials: int) -> None:
+        """Record the outcomes of several trials at once.
+
+        Arguments:
+            successes: Number of successes among the new trials.
+            trials: Number of new trials.
+        """
+        if not 0 <= successes <= trials:
+            raise ValueError("successes must be between 0 and trials")
+        self.successes += successes
+        self.trials += trials
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of successful trials (0.0 before the first trial)."""
+        return self.successes / self.trials if self.trials else 0.0
+
+
+class RunningBinomialTest:
+    """Binomial tail p-values updated in O(1) per trial.
+
+    Tracks X ~ Binomial(n, p) under the null hypothesis and, after every
+    trial, the tails P(X >= k) and P(X <= k) for the observed k successes.
+    Both tails are kept as log-ratios to the point probability P(X = k),
+    which avoids overflow and underflow over long histories. Like any
+    forward recurrence for a tail, the p-values are accurate in absolute
+    terms (about 1e-12); use cumulative_binomial_probabilities when very
+    small p-values are needed to full relative precision.
+    """
+
+    def __init__(self, success_probability: float):
+        """Initialize the test with no trials observed.
+
+        Arguments:
+            success_probability: Success probability under the null hypothesis (p).
+        """
+        if not 0 < success_probability < 1:
+            raise ValueError("success_probability must be strictly between 0 and 1")
+        self.success_probability = success_probability
+        self.successes = 0
+        self.trials = 0
+        self._log_p = math.log(success_probability)
+        self._log_q = math.log1p(-success_probability)
+        self._log_pmf = 0.0  # log P(X = k)
+        self._log_upper = 0.0  # log P(X >= k) / P(X = k)
+        self._log_lower = 0.0  # log P(X <= k) / P(X = k)
+
+    def update(self, success: bool) -> None:
+        """Record the outcome of one trial.
+
+        Arguments:
+            success: True if the trial was a success.
+        """
+        n, k = self.trials, self.successes
+        p = self.success_probability
+        q = 1 - p
+        if success:
+            # P(X' = k+1) = P(X = k) * (n+1)/(k+1) * p
+            log_step = math.log((n + 1) / (k + 1)) + self._log_p
+            # P(X' >= k+1) = P(X = k) * (U - 1 + p)
+            upper = self._log_upper + math.log1p(-q * math.exp(-self._log_upper))
+            # P(X' <= k+1) = P(X = k) * (L + (n-k)p/(k+1))
+            lower = self._log_lower
+            if k < n:
+                lower = _log_add_exp(lower, math.log((n - k) * p / (k + 1)))
+            self.successes += 1
+        else:
+            # P(X' = k) = P(X = k) * (n+1)/(n+1-k) * q
+            log_step = math.log((n + 1) / (n + 1 - k)) + self._log_q
+            # P(X' >= k) = P(X = k) * (U + k*q/(n-k+1))
+            upper = self._log_upper
+            if k > 0:
+                upper = _log_add_exp(upper, math.log(k * q / (n - k + 1)))
+            # P(X' <= k) = P(X = k) * (L - p)
+            lower = self._log_lower + math.log1p(-p * math.exp(-self._log_lower))
+        self.trials += 1
+        self._log_pmf += log_step
+        # Both ratios are >= 1 by definition; clamp away rounding drift
+        self._log_upper = max(0.0, upper - log_step)
+        self._log_lower = max(0.0, lower - log_step)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of successful trials (0.0 before the first trial)."""
+        return self.successes / self.trials if self.trials else 0.0
+
+    @property
+    def probability(self) -> float:
+        """P(X = k) under the null hypothesis."""
+        return math.exp(self._log_pmf)
+
+    @property
+    def p_value_greater(self) -> float:
+        """One-sided p-value P(X >= k) (hit rate above p)."""
+        return min(1.0, math.exp(self._log_pmf + self._log_upper))
+
+    @property
+    def p_value_less(self) -> float:
+        """One-sided p-value P(X <= k) (hit rate below p)."""
+        return min(1.0, math.exp(self._log_pmf + self._log_lower))
+
+
+class EwmaHitRate:
+    """Exponentially weighted hit rate with O(1) updates.
+
+    Every update multiplies the weight of all earlier trials by ``decay``,
+    so recent outcomes count more than old ones.
+    """
+
+    def __init__(self, decay: float):
+        """Initialize the accumulator.
+
+        Arguments:
+            decay: Weight multiplier applied per trial, in (0, 1].
+        """
+        if not 0 < decay <= 1:
+            raise ValueError("decay must be in (0, 1]")
+        self.decay = decay
+        self.weighted_successes = 0.0
+        self.weighted_trials = 0.0
+
+    @classmethod
+    def from_halflife(cls, halflife: float) -> "EwmaHitRate":
+        """Create an accumulator whose weights halve every ``halflife`` trials.
+
+        Arguments:
+            halflife: Number of trials after which an outcome weighs half.
+
+        Returns:
+            A new EwmaHitRate.
+        """
+        if halflife <= 0:
+            raise ValueError("halflife must be positive")
+        return cls(0.5 ** (1 / halflife))
+
+    def update(self, success: bool) -> None:
+        """Record the outcome of one trial.
+
+        Arguments:
+            success: True if the trial was a success.
+        """
+        self.weighted_successes = self.decay * self.weighted_successes + success
+        self.weighted_trials = self.decay * self.weighted_trials + 1
+
+    @property
+    def hit_rate(self) -> float:
+        """Weighted fraction of successful trials (0.0 before the first trial)."""
+        if not self.weighted_trials:
+            return 0.0
+        return self.weighted_successes / self.weighted_trials
+
+    @property
+    def effective_trials(self) -> float:
+        """Total (decayed) weight of the trials seen."""
+        return self.weighted_trials
@@ -2,7 +2,7 @@
 Dictionary Operations
 """
 
-from typing import Any
+from typing import Any, Iterator, Mapping
 
 
 def merge_dicts(dict1: dict[str, Any], dict2: dict[str, Any]) -> dict[str, Any]:
@@ -17,3 +17,106 @@ def merge_dicts(dict1: dict[str, Any], dict2: dict[str, Any]) -> dict[str, Any]:
     """
 
     return {**dict1, **dict2}
+
+
+_MISSING = object()
+
+
+class LayeredConfig(Mapping[str, Any]):
+    """Read-only deep merge of several mappings, resolved lazily.
+
+    Layers are given from lowest to highest priority, like repeated
+    merge_dicts calls: a key in a later layer overrides the same key in an
+    earlier one. Unlike merge_dicts the merge is recursive: when the winning
+    value is a mapping, it is merged with the mappings under the same key in
+    the layers below it (down to the first non-mapping value, which it
+    hides). Other values, lists included, replace lower ones as a whole.
+
+    Nothing is copied: each lookup checks the layers, and nested views are
+    cached, so the layers must not be changed while the view is in use.
+    to_dict() builds the merged result as plain dicts.
+
+    Example:
+        >>> config = LayeredConfig(
+        ...     {"db": {"host": "localhost", "port": 5432}},
+        ...     {"db": {"host": "db.internal"}},
+        ... )
+        >>> config["db"]["host"], config["db"]["port"]
+        ('db.internal', 5432)
+    """
+
+    def __init__(self, *layers: Mapping[str, Any]):
+        """Create a view over layers, from lowest to highest priority.
+
+        Arguments:
+            layers: Mappings to merge, e.g. defaults, file config, overrides.
+        """
+        self.layers = layers
+        self._values: dict[str, Any] = {}
+        self._keys: dict[str, None] | None = None
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._values.get(key, _MISSING)
+        if value is _MISSING:
+            value = self._values[key] = self._resolve(key)
+        return value
+
+    def _resolve(self, key: str) -> Any:
+        mappings: list[Mapping[str, Any]] = []
+        for layer in reversed(self.layers):
+            value = layer.get(key, _MISSING)
+            if value is _MISSING:
+                continue
+            if not isinstance(value, Mapping):
+                if not mappings:
+                    return value
+                break
+            mappings.append(value)
+        if not mappings:
+            raise KeyError(key)
+        mappings.reverse()
+        return LayeredConfig(*mappings)
+
+    def __contains__(self, key: object) -> bool:
+        return any(key in layer for layer in self.layers)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._key_order())
+
+    def __len__(self) -> int:
+        return len(self._key_order())
+
+    def _key_order(self) -> dict[str, None]:
+        if self._keys is None:
+            # Keys in merge_dicts order: first appearance, lowest layer first
+            keys: dict[str, None] = {}
+            for layer in self.layers:
+                keys.update(dict.fromkeys(layer))
+            self._keys = keys
+        return self._keys
+
+    def __repr__(self) -> str:
+        return f"LayeredConfig({', '.join(map(repr, self.layers))})"
+
+    def with_layer(self, layer: Mapping[str, Any]) -> "LayeredConfig":
+        """Return a new view with layer on top (highest priority).
+
+        Arguments:
+            layer: Mapping that overrides the existing layers.
+
+        Returns:
+            A new LayeredConfig; this one is unchanged.
+        """
+        return LayeredConfig(*self.layers, layer)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Build the merged configuration as nested plain dicts.
+
+        Returns:
+            A new dict; values other than merged mappings are not copied.
+        """
+        result = {}
+        for key in self:
+            value = self[key]
+            result[key] = value.to_dict() if isinstance(value, LayeredConfig) else value
+        return result
@@ -1,81 +1,1195 @@
-from io import TextIOWrapper
-from typing import Any
+import bisect
+import copy
+import os
 import re
+import select
+import struct
+import sys
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Callable, Iterator, Mapping, NamedTuple
 
-import yaml
-import tomllib
+from stavroslib.dict import LayeredConfig
 
+# Parser backends (yaml, tomllib) and modules needed by only one feature
+# (snapshots, read_many, inotify) are imported where they are used, so that
+# importing this module stays cheap for callers that only need read_env.
 
-def read_yaml(file: str) -> dict[str, Any] | None:
-    stream: TextIOWrapper = open(file, "r", encoding="utf8")
-    result: dict[str, Any] | None = yaml.load(stream, Loader=yaml.FullLoader)
-    return result
+_MISSING = object()
 
+# Config cache key: (absolute path, reader, immutable result)
+_CacheKey = tuple[str, Callable[[str], Any], bool]
 
-def read_toml(file: str) -> dict[str, Any] | None:
+# Compiled schema (see compile_schema): returns the data or raises SchemaError
+Validator = Callable[[Any], Any]
+
+
+def read_yaml(
+    file: str,
+    safe: bool = True,
+    cache_dir: str | os.PathLike[str] | None = None,
+    schema: Validator | None = None,
+) -> dict[str, Any] | None:
+    """Read a YAML file into a dict.
+
+    Uses the libyaml (C) loader when PyYAML was built with it, which is
+    several times faster than the pure-Python loader; yaml_backend() tells
+    which one is active. Both produce the same data.
+
+    Arguments:
+        file: Path to the YAML file.
+        safe: Use the safe loader, which only builds standard YAML types
+            (default). False uses the full loader, which also accepts
+            python/* tags such as !!python/tuple.
+        cache_dir: Directory for binary snapshots of parsed files. When
+            given, a file whose content is unchanged since it was last
+            parsed is unpickled from its snapshot instead of re-parsed.
+            Only use a directory that no one else can write to, since
+            snapshots are pickles.
+        schema: Validator from compile_schema, run on the parsed data.
+
+    Returns:
+        The first document of the file, or None for an empty file.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        yaml.YAMLError: If the YAML is invalid.
+        SchemaError: If the data does not match the schema.
+    """
+    import yaml
+
+    loader = _yaml_loader(safe)
+    # libyaml reads bytes directly and detects the encoding (UTF-8 by default)
+    with open(file, "rb") as stream:
+        if cache_dir is None:
+            result: dict[str, Any] | None = yaml.load(stream, Loader=loader)
+        else:
+            content = stream.read()
+            result = _load_with_snapshot(
+                cache_dir,
+                file,
+                "yaml-safe" if safe else "yaml-full",
+                content,
+                lambda: yaml.load(content, Loader=loader),
+            )
+    return result if schema is None else schema(result)
+
+
+def iter_yaml(file: str, safe: bool = True) -> Iterator[Any]:
+    """Stream the documents of a multi-document YAML file one at a time.
+
+    Documents separated by "---" are parsed lazily with the same loader as
+    read_yaml, and the file is read in chunks, so memory stays bounded by
+    the largest document rather than the file size. The file is closed
+    when the iterator is exhausted or closed.
+
+    Arguments:
+        file: Path to the YAML file.
+        safe: Use the safe loader (default); see read_yaml.
+
+    Returns:
+        Iterator of documents (an empty document yields None).
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        yaml.YAMLError: If a document is invalid (raised when it is reached).
+
+    Example:
+        >>> for event in iter_yaml("events.yaml"):
+        ...     handle(event)
+    """
+    import yaml
+
+    with open(file, "rb") as stream:
+        yield from yaml.load_all(stream, Loader=_yaml_loader(safe))
+
+
+def yaml_backend() -> str:
+    """Return the YAML backend used by read_yaml: "libyaml" or "python"."""
+    import yaml
+
+    return "libyaml" if _yaml_loader(True) is not yaml.SafeLoader else "python"
+
+
+def _yaml_loader(safe: bool) -> Any:
+    """Fastest available loader class: libyaml-based if PyYAML has it."""
+    import yaml
+
+    if safe:
+        return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return getattr(yaml, "CFullLoader", yaml.FullLoader)
+
+
+def read_toml(
+    file: str,
+    cache_dir: str | os.PathLike[str] | None = None,
+    schema: Validator | None = None,
+) -> dict[str, Any] | None:
     """Read TOML file into a dict using stdlib tomllib.
 
     Returns None for empty files; raises tomllib.TOMLDecodeError on invalid TOML.
+    With cache_dir, unchanged files are loaded from binary snapshots instead
+    of re-parsed, and with schema the result is checked by that validator
+    (see read_yaml).
     """
+    import tomllib
+
     with open(file, "rb") as fp:
         data = fp.read()
-        if data.strip() == b"":
-            return None
+    result: dict[str, Any] | None
+    if data.strip() == b"":
+        result = None
+    elif cache_dir is None:
         # TOML is UTF-8 per spec
-        return tomllib.loads(data.decode("utf-8"))
+        result = tomllib.loads(data.decode("utf-8"))
+    else:
+        result = _load_with_snapshot(
+            cache_dir, file, "toml", data, lambda: tomllib.loads(data.decode("utf-8"))
+        )
+    return result if schema is None else schema(result)
+
+
+# Snapshot header: format version byte, then the blake2b digest of the source
+_SNAPSHOT_FORMAT = b"\x01"
+_SNAPSHOT_DIGEST_SIZE = 32
+
+
+def _load_with_snapshot(
+    cache_dir: str | os.PathLike[str],
+    file: str,
+    variant: str,
+    content: bytes,
+    parse: Callable[[], Any],
+) -> Any:
+    """Return parse(), or the result saved by an earlier parse of content.
+
+    A snapshot is named after the absolute path of the file and the reader
+    variant, and starts with the digest of the content it was parsed from;
+    it is only unpickled when that digest matches, so edits, truncated
+    writes and stale formats all fall back to parsing. New snapshots are
+    written to a temporary file and renamed into place, so concurrent
+    readers never see a partial one. Failing to write a snapshot is not an
+    error.
+    """
+    import hashlib
+    import pickle
+    import tempfile
+
+    digest = hashlib.blake2b(content, digest_size=_SNAPSHOT_DIGEST_SIZE).digest()
+    header = _SNAPSHOT_FORMAT + digest
+    key = f"{os.path.abspath(file)}\0{variant}".encode()
+    name = hashlib.blake2b(key, digest_size=16).hexdigest()
+    path = os.path.join(cache_dir, f"{name}.pickle")
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(header)) == header:
+                return pickle.load(f)
+    except Exception:
+        pass  # missing or corrupt snapshot: parse and (over)write it
 
+    data = parse()
+    temp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, prefix=f".{name}.")
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            pickle.dump(data, f, protocol=5)
+        os.replace(temp_path, path)
+    except Exception:
+        if temp_path is not None and os.path.exists(temp_path):
+            os.unlink(temp_path)
+    return data
 
-def read_env(file_path: str) -> dict[str, str]:
+
+def read_env(file_path: str, interpolate: bool = False) -> dict[str, str]:
     """Read .env file into a dictionary.
 
     Supports KEY=VALUE syntax, comments (#), quoted values (single/double),
-    export prefix, and whitespace handling.
+    export prefix, and whitespace handling:
+
+    - Unquoted values end at a "#" preceded by whitespace, or at the end of
+      the line; surrounding whitespace is removed.
+    - Single-quoted values are literal and may span several lines.
+    - Double-quoted values may span several lines and understand the
+      escapes \\n, \\t, \\r, \\", \\\\ and \\$.
+    - A closing quote is normally followed only by whitespace or a comment.
+      If other text follows and the line ends with the same quote, just the
+      outer quotes are removed and the rest is kept literally, so A="a" "b"
+      gives 'a" "b'; otherwise the line is read as an unquoted value.
+    - With interpolate, unquoted and double-quoted values expand $VAR,
+      ${VAR} and ${VAR:-default}. A variable refers to its latest
+      definition earlier in the file, else to a later one, else to
+      os.environ, else to "".
+    - Lines that are not assignments are ignored.
 
     Arguments:
         file_path: Path to the .env file.
+        interpolate: Expand variable references (default: False, so "$"
+            is kept literally as in plain KEY=VALUE files).
 
     Returns:
         Dictionary of environment variables.
 
     Raises:
         FileNotFoundError: If the file does not exist.
+        ValueError: If variable references form a cycle.
     """
-    env_vars: dict[str, str] = {}
-
     with open(file_path, "r", encoding="utf-8") as f:
-        for line in f:
-            # Strip whitespace
-            line = line.strip()
+        text = f.read()
+
+    keys, values, quotes = _env_entries(text)
+    if interpolate and "$" in text:
+        return _EnvInterpolation(keys, values, quotes).resolve()
+    for index, quote in quotes.items():
+        if quote == '"' and "\\" in values[index]:
+            values[index] = _unescape(values[index])
+    return dict(zip(keys, values))
+
+
+# Quoted value at the start of a string; double quotes allow escapes
+_ENV_QUOTED = {
+    "'": re.compile(r"'([^']*)'"),
+    '"': re.compile(r'"((?:[^"\\]|\\[\s\S])*)"'),
+}
+
+# Start of an inline comment in an unquoted value
+_ENV_COMMENT = re.compile(r"\s#")
+
+
+def _env_entries(text: str) -> tuple[list[str], list[str], dict[int, str]]:
+    """Split .env text into its assignments, in file order.
+
+    Works line by line with string methods, which is much cheaper than
+    matching the whole text with one regular expression; only quoted values
+    that do not close on their own line go through a regex, extended over
+    the following lines until the closing quote is found.
+
+    Returns:
+        The keys, their raw (still escaped) values, and the quote character
+        of every quoted value by assignment index.
+    """
+    keys: list[str] = []
+    values: list[str] = []
+    quotes: dict[int, str] = {}
+    add_key = keys.append
+    add_value = values.append
+    lines = text.split("\n")
+    count = len(lines)
+    # Quote characters known not to be closed anywhere further down
+    unclosed: set[str] = set()
+    i = 0
+    while i < count:
+        line = lines[i]
+        i += 1
+        if "=" not in line:
+            continue
+        key, _, rest = line.partition("=")
+        key = key.strip()
+        if not key or key[0] == "#":
+            continue
+        if " " in key or "\t" in key:
+            prefix, name = key.split(None, 1)
+            if prefix == "export":
+                key = name
+        value = rest.strip()
+        if value and value[0] in "'\"":
+            quote = value[0]
+            if (
+                value[-1] == quote
+                and value.find(quote, 1) == len(value) - 1
+                and "\\" not in value
+            ):
+                # Common case: the whole value is one simple quoted string
+                quotes[len(keys)] = quote
+                add_key(key)
+                add_value(value[1:-1])
+                continue
+            pattern = _ENV_QUOTED[quote]
+            match = pattern.match(value)
+            next_line = i
+            if match is None and quote not in unclosed:
+                # Spans several lines: keep their whitespace verbatim
+                value = rest.lstrip()
+                end = i
+                while end < count:
+                    line = lines[end]
+                    end += 1
+                    value += "\n" + line
+                    if quote in line:
+                        match = pattern.match(value)
+                        if match is not None:
+                            next_line = end
+                            break
+                else:
+                    unclosed.add(quote)
+            if match is not None:
+                tail = value[match.end() :].lstrip()
+                if not tail or tail[0] == "#":
+                    quotes[len(keys)] = quote
+                    add_key(key)
+                    add_value(match[1])
+                    i = next_line
+                    continue
+            value = rest.strip()
+            if len(value) > 1 and value[-1] == quote:
+                # Text after the closing quote: drop only the outer quotes
+                # and keep the rest literally, like a single-quoted value
+                quotes[len(keys)] = "'"
+                add_key(key)
+                add_value(value[1:-1])
+                continue
+            # No closing quote: take the line as an unquoted value
+        if "#" in value:
+            if value[0] == "#":
+                value = ""
+            else:
+                comment = _ENV_COMMENT.search(value)
+                if comment is not None:
+                    value = value[: comment.start()].rstrip()
+        add_key(key)
+        add_value(value)
+    return keys, values, quotes
+
+
+_ENV_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", '"': '"', "\\": "\\", "$": "$"}
+
+# Escape sequence, ${NAME}, ${NAME:-default} or $NAME
+_ENV_TOKEN = re.compile(
+    r"\\([\s\S])|\$(?:\{([A-Za-z_]\w*)(?::-([^}]*))?\}|([A-Za-z_]\w*))"
+)
+
+
+def _unescape(raw: str) -> str:
+    """Decode the escape sequences of a double-quoted value."""
+    return _ENV_TOKEN.sub(
+        lambda m: (_ENV_ESCAPES.get(m[1], m[0]) if m[1] is not None else m[0]),
+        raw,
+    )
+
+
+class _EnvInterpolation:
+    """Expand variable references between the assignments of one file."""
+
+    def __init__(self, keys: list[str], raw: list[str], quotes: dict[int, str]):
+        self.keys = keys
+        self.raw = raw
+        self.quotes = quotes
+        # Last definition of every key, and all definitions of repeated keys
+        self.last = {key: index for index, key in enumerate(keys)}
+        self.repeated: dict[str, list[int]] = {}
+        if len(self.last) < len(keys):
+            for index, key in enumerate(keys):
+                self.repeated.setdefault(key, []).append(index)
+            self.repeated = {
+                key: indexes
+                for key, indexes in self.repeated.items()
+                if len(indexes) > 1
+            }
+        self.values: dict[int, str] = {}
+        self.active: set[int] = set()
+
+    def resolve(self) -> dict[str, str]:
+        result = dict(zip(self.keys, self.raw))
+        last = self.last
+        for index in [i for i, raw in enumerate(self.raw) if "$" in raw or "\\" in raw]:
+            key = self.keys[index]
+            if last[key] == index:
+                result[key] = self.value(index)
+        return result
+
+    def value(self, index: int) -> str:
+        value = self.values.get(index)
+        if value is not None:
+            return value
+        raw = self.raw[index]
+        quote = self.quotes.get(index, "")
+        if quote == "'" or ("$" not in raw and "\\" not in raw):
+            value = raw
+        else:
+            if index in self.active:
+                raise ValueError(
+                    f"Variable reference cycle involving {self.keys[index]}"
+                )
+            self.active.add(index)
+
+            def replace(match: re.Match[str]) -> str:
+                if match[1] is not None:
+                    # Escapes only exist in double-quoted values
+                    if quote != '"':
+                        return match[0]
+                    return _ENV_ESCAPES.get(match[1], match[0])
+                name = match[2] or match[4]
+                value = self.lookup(name, index)
+                if not value and match[3] is not None:
+                    return match[3]
+                return value
+
+            value = _ENV_TOKEN.sub(replace, raw)
+            self.active.discard(index)
+        self.values[index] = value
+        return value
+
+    def lookup(self, name: str, index: int) -> str:
+        """Value of a variable referenced from the assignment at index."""
+        indexes = self.repeated.get(name)
+        if indexes is not None:
+            earlier = bisect.bisect_left(indexes, index)
+            return self.value(indexes[earlier - 1] if earlier else indexes[-1])
+        last = self.last.get(name)
+        if last is not None and last != index:
+            return self.value(last)
+        return os.environ.get(name, "")
+
+
+# One compiled schema node: check(value, path, errors) appends the
+# (path, message) of every mismatch. Paths are (parent path, key) pairs,
+# () at the root, and only formatted when an error is reported.
+_Check = Callable[[Any, Any, list[tuple[str, str]]], None]
+
+
+class SchemaError(ValueError):
+    """Parsed data that does not match a schema.
+
+    Attributes:
+        errors: (path, message) for every mismatch. Paths look like
+            "servers[0].host"; the root is "".
+    """
+
+    def __init__(self, errors: list[tuple[str, str]]):
+        self.errors = errors
+        lines = [f"{path or '<root>'}: {message}" for path, message in errors]
+        super().__init__(f"{len(errors)} schema error(s):\n  " + "\n  ".join(lines))
+
+    def __reduce__(self) -> tuple[type["SchemaError"], tuple[Any, ...]]:
+        return (SchemaError, (self.errors,))
+
+
+def compile_schema(schema: Any, allow_extra: bool = False) -> Validator:
+    """Compile a schema into a validator function.
+
+    Schemas are built from:
+
+    - A type, e.g. str: the value must be an instance of it. bool is not
+      accepted as int, int is accepted as float, and dict and list also
+      accept the read-only views of ConfigCache (any mapping, tuples).
+    - A dict of key -> schema: the value must be a mapping holding those
+      keys. Keys ending in "?" are optional (the "?" is not part of the
+      key); other keys are errors unless allow_extra is True.
+    - A one-item list [schema]: a list whose items all match schema.
+    - A tuple of schemas: the value must match at least one of them.
+    - None: the value must be None. typing.Any accepts anything.
+
+    The schema is turned once into a tree of closures, each specialized
+    for its node, so validation walks the data without interpreting the
+    schema again. Every mismatch is collected before raising.
+
+    Arguments:
+        schema: The schema.
+        allow_extra: Accept mapping keys that the schema does not list.
+
+    Returns:
+        A function that returns the data it is given, or raises SchemaError
+        listing every mismatch with its path.
+
+    Raises:
+        TypeError: If the schema is not built from the forms above.
+
+    Example:
+        >>> validate = compile_schema({"db": {"host": str, "port?": int}})
+        >>> config = read_toml("app.toml", schema=validate)
+        >>> validate({"db": {"port": "5432"}})
+        Traceback (most recent call last):
+        ...
+        stavroslib.parse.SchemaError: 2 schema error(s):
+          db.host: missing required key
+          db.port: expected int, got str
+    """
+    check = _compile_check(schema, allow_extra)
+
+    def validate(data: Any) -> Any:
+        errors: list[tuple[str, str]] = []
+        check(data, (), errors)
+        if errors:
+            raise SchemaError(errors)
+        return data
+
+    return validate
+
+
+def _compile_check(schema: Any, allow_extra: bool) -> _Check:
+    """Compiled check for one schema node (see compile_schema)."""
+    if schema is Any:
+        return lambda value, path, errors: None
+    if schema is None:
+        return _type_check(type(None))
+    if isinstance(schema, type):
+        return _type_check(schema)
+    if isinstance(schema, dict):
+        return _mapping_check(schema, allow_extra)
+    if isinstance(schema, list) and len(schema) == 1:
+        return _list_check(schema[0], allow_extra)
+    if isinstance(schema, tuple) and schema:
+        return _union_check(schema, allow_extra)
+    raise TypeError(f"Unsupported schema: {schema!r}")
+
+
+def _type_check(expected: type) -> _Check:
+    name = _describe(expected)
+    accepted: Any = expected
+    if expected is dict:
+        accepted = Mapping
+    elif expected is list:
+        accepted = (list, tuple)
+    elif expected is float:
+        accepted = (int, float)
+    exclude_bool = expected in (int, float)
+
+    def check(value: Any, path: Any, errors: list[tuple[str, str]]) -> None:
+        # The exact-class test is the fast path for valid data
+        if value.__class__ is expected:
+            return
+        if not isinstance(value, accepted) or (
+            exclude_bool and isinstance(value, bool)
+        ):
+            errors.append(
+                (_format_path(path), f"expected {name}, got {_describe(type(value))}")
+            )
+
+    return check
+
+
+def _mapping_check(schema: dict[Any, Any], allow_extra: bool) -> _Check:
+    fields = []
+    for key, item_schema in schema.items():
+        required = not (isinstance(key, str) and key.endswith("?"))
+        name = key if required else key[:-1]
+        # Values of a plain type are checked inline, without a call
+        exact = item_schema if isinstance(item_schema, type) else None
+        item_check = _compile_check(item_schema, allow_extra)
+        fields.append((name, item_check, required, exact))
+    names = frozenset(name for name, _, _, _ in fields)
+
+    def check(value: Any, path: Any, errors: list[tuple[str, str]]) -> None:
+        if not isinstance(value, Mapping):
+            errors.append(
+                (_format_path(path), f"expected mapping, got {_describe(type(value))}")
+            )
+            return
+        found = 0
+        for name, check_item, required, exact in fields:
+            item = value.get(name, _MISSING)
+            if item is _MISSING:
+                if required:
+                    errors.append((_format_path((path, name)), "missing required key"))
+                continue
+            found += 1
+            if item.__class__ is not exact:
+                check_item(item, (path, name), errors)
+        if not allow_extra and found != len(value):
+            for key in value:
+                if key not in names:
+                    errors.append((_format_path((path, key)), "unexpected key"))
+
+    return check
+
 
-            # Skip empty lines and comments
-            if not line or line.startswith("#"):
+def _list_check(item_schema: Any, allow_extra: bool) -> _Check:
+    check_item = _compile_check(item_schema, allow_extra)
+    # Lists of a plain type are checked in one pass over the item classes
+    item_class = item_schema if isinstance(item_schema, type) else None
+
+    def check(value: Any, path: Any, errors: list[tuple[str, str]]) -> None:
+        if not isinstance(value, (list, tuple)):
+            errors.append(
+                (_format_path(path), f"expected list, got {_describe(type(value))}")
+            )
+            return
+        if item_class is not None and all(
+            item.__class__ is item_class for item in value
+        ):
+            return
+        for index, item in enumerate(value):
+            check_item(item, (path, index), errors)
+
+    return check
+
+
+def _union_check(schemas: tuple[Any, ...], allow_extra: bool) -> _Check:
+    checks = [_compile_check(schema, allow_extra) for schema in schemas]
+    names = " or ".join(_describe(schema) for schema in schemas)
+
+    def check(value: Any, path: Any, errors: list[tuple[str, str]]) -> None:
+        for check_one in checks:
+            attempt: list[tuple[str, str]] = []
+            check_one(value, path, attempt)
+            if not attempt:
+                return
+        errors.append(
+            (_format_path(path), f"expected {names}, got {_describe(type(value))}")
+        )
+
+    return check
+
+
+def _describe(schema: Any) -> str:
+    """Short name of a schema node or type for error messages."""
+    if schema is None or schema is type(None):
+        return "None"
+    if isinstance(schema, type):
+        return schema.__name__
+    if isinstance(schema, dict):
+        return "mapping"
+    if isinstance(schema, list):
+        return "list"
+    return repr(schema)
+
+
+def _format_path(path: Any) -> str:
+    """Turn a linked (parent, key) path into "a.b[2].c"."""
+    parts = []
+    while path:
+        path, key = path
+        parts.append(f"[{key}]" if isinstance(key, int) else f".{key}")
+    return "".join(reversed(parts)).lstrip(".")
+
+
+class ConfigCache:
+    """Thread-safe LRU cache of parsed config files, validated by stat.
+
+    Entries are keyed by absolute path, reader and result kind. A lookup
+    stats the file and re-parses it only if its (mtime_ns, size, inode)
+    changed, so unchanged files are never re-opened. Files changed twice
+    within the filesystem's timestamp resolution without a size change can
+    go unnoticed.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        """Initialize an empty cache.
+
+        Arguments:
+            max_entries: Maximum number of cached files; the least recently
+                used entry is dropped beyond it (default: 128).
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # Key -> ((mtime_ns, size, inode), data)
+        self._entries: OrderedDict[_CacheKey, tuple[tuple[int, int, int], Any]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def read(
+        self, file: str, reader: Callable[[str], Any], immutable: bool = False
+    ) -> Any:
+        """Return the parsed contents of a file, parsing it only if it changed.
+
+        Arguments:
+            file: Path to the config file.
+            reader: Parser called with the path on a miss, e.g. read_toml.
+            immutable: Return a shared read-only view (MappingProxyType for
+                dicts, tuples for lists) instead of a private deep copy.
+                Read-only results are not copied on a hit.
+
+        Returns:
+            The parsed data.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        path = os.path.abspath(file)
+        key = (path, reader, immutable)
+        signature = _file_signature(path)
+        data = self._lookup(key, signature)
+        if data is _MISSING:
+            # Parse outside the lock so slow files do not block other readers
+            parsed = reader(path)
+            data = _freeze(parsed) if immutable else parsed
+            self._store(key, signature, data)
+        return data if immutable else copy.deepcopy(data)
+
+    def invalidate(self, file: str) -> None:
+        """Drop every cached entry for a file."""
+        path = os.path.abspath(file)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == path]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop all entries and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: _CacheKey, signature: tuple[int, int, int]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return _MISSING
+
+    def _store(
+        self, key: _CacheKey, signature: tuple[int, int, int], data: Any
+    ) -> None:
+        with self._lock:
+            self._entries[key] = (signature, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def _file_signature(path: str) -> tuple[int, int, int]:
+    """(mtime_ns, size, inode) of a file, which changes whenever it is written."""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only version of parsed data: dicts become mapping proxies."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+# Process-wide cache used by read_cached
+config_cache = ConfigCache()
+
+
+def read_cached(file: str, immutable: bool = False) -> Any:
+    """Read a TOML, YAML or .env file through the process-wide config cache.
+
+    The parser is chosen by file name: .toml, .yaml/.yml, or .env (including
+    a file named just ".env").
+
+    Arguments:
+        file: Path to the config file.
+        immutable: Return a shared read-only view instead of a deep copy
+            (see ConfigCache.read).
+
+    Returns:
+        The parsed data, as returned by read_toml, read_yaml or read_env.
+
+    Raises:
+        ValueError: If the file type is not recognized.
+        FileNotFoundError: If the file does not exist.
+
+    Example:
+        >>> settings = read_cached("settings.toml", immutable=True)
+        >>> settings["database"]["host"]
+        'localhost'
+    """
+    return config_cache.read(file, _reader_for(file), immutable)
+
+
+def read_layered(
+    *files: str, cached: bool = False, missing_ok: bool = False
+) -> LayeredConfig:
+    """Read config files into one deep-merged LayeredConfig.
+
+    Later files override earlier ones key by key, at any depth, without
+    copying the parsed data (see stavroslib.dict.LayeredConfig).
+
+    Arguments:
+        files: TOML, YAML or .env files, from lowest to highest priority.
+        cached: Read through the process-wide config cache (read_cached),
+            sharing its read-only results instead of re-parsing.
+        missing_ok: Skip files that do not exist instead of raising.
+
+    Returns:
+        The merged configuration view. Empty files add nothing.
+
+    Raises:
+        FileNotFoundError: If a file does not exist and missing_ok is False.
+        ValueError: If a file type is not recognized, or a file does not
+            hold a mapping.
+
+    Example:
+        >>> config = read_layered("defaults.toml", "local.yaml", ".env")
+        >>> config["database"]["host"]
+        'localhost'
+    """
+    layers = []
+    for file in files:
+        try:
+            if cached:
+                data = read_cached(file, immutable=True)
+            else:
+                data = _reader_for(file)(file)
+        except FileNotFoundError:
+            if missing_ok:
                 continue
+            raise
+        if data is None:
+            continue
+        if not isinstance(data, Mapping):
+            raise ValueError(f"Config file does not hold a mapping: {file}")
+        layers.append(data)
+    return LayeredConfig(*layers)
+
+
+class BulkLoadResult(NamedTuple):
+    """Files loaded by read_many.
+
+    Attributes:
+        data: Parsed contents of every file that loaded, by path relative
+            to the search root, in path order.
+        errors: Exception raised for every file that failed, by path.
+    """
+
+    data: dict[str, Any]
+    errors: dict[str, Exception]
+
+
+def read_many(
+    pattern: str,
+    root: str = ".",
+    workers: int | None = None,
+    chunksize: int = 16,
+    cached: bool = False,
+    immutable: bool = False,
+) -> BulkLoadResult:
+    """Read every config file matching a glob pattern on a process pool.
+
+    Files are found with stavroslib.file.find_files and parsed with
+    read_toml, read_yaml or read_env according to their name. Paths are
+    sent to the workers in chunks, so each worker reads its own files and
+    only the parsed data travels back. A file that fails to load does not
+    stop the others: its exception is collected in ``errors``.
+
+    Arguments:
+        pattern: Glob pattern relative to root, e.g. "fixtures/**/*.toml".
+        root: Directory to search (default: current directory).
+        workers: Number of worker processes; None uses all CPUs, 1 parses
+            in this process.
+        chunksize: Number of files per task (default: 16).
+        cached: Go through the process-wide config cache (read_cached):
+            unchanged cached files are not sent to the pool, and the files
+            parsed there are added to the cache.
+        immutable: With cached, return the cache's shared read-only views
+            instead of private copies (see ConfigCache.read).
+
+    Returns:
+        The parsed data and the errors, both keyed by the paths returned
+        by find_files.
 
-            # Remove export prefix if present
-            if line.startswith("export "):
-                line = line[7:].strip()
+    Raises:
+        ValueError: If chunksize is less than 1.
+
+    Example:
+        >>> result = read_many("fixtures/**/*.yaml", workers=4)
+        >>> for path, error in result.errors.items():
+        ...     print(f"{path}: {error}")
+        >>> fixtures = result.data
+    """
+    from stavroslib._parallel import pool_starmap
+    from stavroslib.file import find_files
 
-            # Split on first = sign
-            if "=" not in line:
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    loaded: dict[str, Any] = {}
+    errors: dict[str, Exception] = {}
+    # Path -> (cache key, file signature) of the cache misses
+    misses: dict[str, tuple[_CacheKey, tuple[int, int, int]]] = {}
+    pending: list[tuple[str, str]] = []
+    for path in find_files(pattern, root):
+        file = os.path.join(root, path)
+        if os.path.isdir(file):
+            continue
+        if cached:
+            try:
+                key = (os.path.abspath(file), _reader_for(file), immutable)
+                signature = _file_signature(file)
+            except (OSError, ValueError) as exc:
+                errors[path] = exc
+                continue
+            data = config_cache._lookup(key, signature)
+            if data is not _MISSING:
+                loaded[path] = data if immutable else copy.deepcopy(data)
                 continue
+            misses[path] = (key, signature)
+        pending.append((path, file))
+
+    tasks = (
+        (pending[start : start + chunksize],)
+        for start in range(0, len(pending), chunksize)
+    )
+    for results in pool_starmap(_read_files, tasks, workers):
+        for path, data, error in results:
+            if error is not None:
+                errors[path] = error
+                continue
+            if path in misses:
+                key, signature = misses[path]
+                stored = _freeze(data) if immutable else data
+                config_cache._store(key, signature, stored)
+                data = stored if immutable else copy.deepcopy(data)
+            loaded[path] = data
+    return BulkLoadResult(
+        data=dict(sorted(loaded.items())), errors=dict(sorted(errors.items()))
+    )
+
+
+def _read_files(
+    files: list[tuple[str, str]],
+) -> list[tuple[str, Any, Exception | None]]:
+    """Parse (path, file) pairs, returning (path, data, error) for each."""
+    results: list[tuple[str, Any, Exception | None]] = []
+    for path, file in files:
+        try:
+            results.append((path, _reader_for(file)(file), None))
+        except Exception as exc:
+            results.append((path, None, exc))
+    return results
+
+
+def _reader_for(file: str) -> Callable[[str], Any]:
+    """Parser for a config file, chosen by its name."""
+    name = os.path.basename(file).lower()
+    if name.endswith(".toml"):
+        return read_toml
+    if name.endswith((".yaml", ".yml")):
+        return read_yaml
+    if name.endswith(".env"):
+        return read_env
+    raise ValueError(f"Unsupported config file type: {file}")
+
+
+class ConfigWatcher:
+    """Keep a parsed config file up to date as it changes on disk.
+
+    The file is parsed once on creation; start() then watches it from a
+    background thread, with inotify on Linux and by polling its stat
+    otherwise. It is re-parsed only when its (mtime_ns, size, inode)
+    changes, and the new snapshot replaces the old one in a single
+    assignment, so readers of ``snapshot`` never block and never see a
+    half-built config. Snapshots are read-only (see ConfigCache.read), since
+    they are shared between threads.
 
-            key, _, value = line.partition("=")
-            key = key.strip()
-            value = value.strip()
+    Example:
+        >>> with ConfigWatcher("settings.toml") as watcher:
+        ...     watcher.subscribe(lambda config: print("reloaded", config))
+        ...     serve(lambda: watcher.snapshot["database"])
+    """
+
+    def __init__(
+        self,
+        file: str,
+        reader: Callable[[str], Any] | None = None,
+        poll_interval: float = 1.0,
+        on_error: Callable[[Exception], None] | None = None,
+        use_inotify: bool = True,
+    ):
+        """Load the file and prepare the watcher (call start() to watch).
+
+        Arguments:
+            file: Path to the config file.
+            reader: Parser called with the path, e.g. read_toml (default:
+                chosen by file name, as in read_cached).
+            poll_interval: Seconds between stat checks when polling, and the
+                longest wait before a missed inotify event is caught up.
+            on_error: Called with the exception when a reload or a
+                subscriber fails; the previous snapshot is kept. If on_error
+                itself raises, its exception is stored in last_error and
+                watching goes on.
+            use_inotify: Use inotify when available (default: True).
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        self.path = os.path.abspath(file)
+        self.reader = reader if reader is not None else _reader_for(file)
+        self.poll_interval = poll_interval
+        self.on_error = on_error
+        self.use_inotify = use_inotify
+        self.last_error: Exception | None = None
+        self._subscribers: list[Callable[[Any], None]] = []
+        self._signature = _file_signature(self.path)
+        self._snapshot = _freeze(self.reader(self.path))
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        # Written to by stop() to wake a thread blocked on inotify
+        self._wake_fd: int | None = None
+
+    @property
+    def snapshot(self) -> Any:
+        """The most recently loaded (read-only) config."""
+        return self._snapshot
+
+    def subscribe(self, callback: Callable[[Any], None]) -> None:
+        """Call callback(snapshot) from the watcher thread after each reload."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Any], None]) -> None:
+        """Stop calling a subscribed callback."""
+        self._subscribers.remove(callback)
+
+    def reload(self) -> bool:
+        """Re-parse the file now if it changed since the last load.
+
+        Returns:
+            True if a new snapshot was swapped in.
+        """
+        try:
+            signature = _file_signature(self.path)
+            if signature == self._signature:
+                return False
+            snapshot = _freeze(self.reader(self.path))
+        except Exception as exc:
+            self._report(exc)
+            return False
+        self._signature = signature
+        self._snapshot = snapshot
+        for callback in list(self._subscribers):
+            try:
+                callback(snapshot)
+            except Exception as exc:
+                self._report(exc)
+        return True
+
+    def start(self) -> "ConfigWatcher":
+        """Start watching from a daemon thread."""
+        if self._thread is None:
+            self._stop.clear()
+            wake_read, self._wake_fd = os.pipe()
+            self._thread = threading.Thread(
+                target=self._watch,
+                args=(wake_read,),
+                name=f"ConfigWatcher({self.path})",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop watching and wait for the watcher thread to finish."""
+        self._stop.set()
+        thread, wake_fd = self._thread, self._wake_fd
+        if thread is None or wake_fd is None:
+            return
+        self._thread = self._wake_fd = None
+        try:
+            if thread.is_alive():
+                try:
+                    os.write(wake_fd, b"\0")
+                except OSError:
+                    # The thread closed its end while exiting
+                    pass
+                thread.join()
+        finally:
+            os.close(wake_fd)
+
+    def __enter__(self) -> "ConfigWatcher":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
 
-            # Remove inline comments (but not if inside quotes)
-            if "#" in value:
-                # Simple approach: only remove if not quoted
-                if not (value.startswith('"') or value.startswith("'")):
-                    value = value.split("#")[0].strip()
+    def _report(self, exc: Exception) -> None:
+        self.last_error = exc
+        if self.on_error is not None:
+            try:
+                self.on_error(exc)
+            except Exception as handler_exc:
+                # A failing handler must not end the watcher thread
+                self.last_error = handler_exc
 
-            # Remove quotes if present
-            if len(value) >= 2:
-                if (value.startswith('"') and value.endswith('"')) or (
-                    value.startswith("'") and value.endswith("'")
+    def _watch(self, wake_fd: int) -> None:
+        inotify = (
+            _Inotify.open(os.path.dirname(self.path)) if self.use_inotify else None
+        )
+        try:
+            name = os.fsencode(os.path.basename(self.path))
+            while not self._stop.is_set():
+                if inotify is None:
+                    self._stop.wait(self.poll_interval)
+                # Events for other files in the directory only cost a stat
+                elif (
+                    inotify.wait(self.poll_interval, wake_fd)
+                    and name not in inotify.read()
                 ):
-                    value = value[1:-1]
+                    continue
+                if not self._stop.is_set():
+                    self.reload()
+        finally:
+            os.close(wake_fd)
+            if inotify is not None:
+                inotify.close()
+
+
+class _Inotify:
+    """Minimal inotify watch on one directory, through ctypes (Linux only).
+
+    The directory is watched rather than the file, so editors that save by
+    renaming a new file over the old one are noticed.
+    """
+
+    # IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+    # | IN_DELETE; not IN_MODIFY, which fires while a file is half written
+    _MASK = 0x004 | 0x008 | 0x040 | 0x080 | 0x100 | 0x200
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, fd: int):
+        self.fd = fd
+
+    @classmethod
+    def open(cls, directory: str) -> "_Inotify | None":
+        """Watch a directory, or return None where inotify is unavailable.
+
+        Any failure returns None, so the caller falls back to polling.
+        """
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            import ctypes
+
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                return None
+            if libc.inotify_add_watch(fd, os.fsencode(directory), cls._MASK) < 0:
+                os.close(fd)
+                return None
+        except Exception:
+            return None
+        return cls(fd)
+
+    def wait(self, timeout: float, wake_fd: int) -> bool:
+        """Wait up to timeout seconds, or until wake_fd is readable.
+
+        Returns:
+            True if events are ready.
+        """
+        ready, _, _ = select.select([self.fd, wake_fd], [], [], timeout)
+        return self.fd in ready
 
-            env_vars[key] = value
+    def read(self) -> set[bytes]:
+        """Read the pending events and return the file names they concern."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        names = set()
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size
+            names.add(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+        return names
 
-    return env_vars
+    def close(self) -> None:
+        os.close(self.fd)
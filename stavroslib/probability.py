@@ -1,34 +1,64 @@
 """Probability and Statistics Utilities"""
 
 import math
-
-
-def convert_dec_to_prob(dec: float) -> float:
+import sys
+from decimal import MAX_EMAX, MIN_EMIN, Decimal, localcontext
+from fractions import Fraction
+from typing import Literal, Sequence, TypeVar, overload
+
+# The odds conversions and the binomial functions accept ``exact=True`` to
+# compute with fractions.Fraction instead of floats (the overround functions
+# do not). Float inputs are converted with
+# Fraction(x), i.e. using their exact binary value; pass a Fraction (or a
+# string such as "0.33" via Fraction("0.33")) to use a decimal value exactly.
+
+
+@overload
+def convert_dec_to_prob(
+    dec: float | Fraction, exact: Literal[False] = ...
+) -> float: ...
+@overload
+def convert_dec_to_prob(dec: float | Fraction, exact: Literal[True]) -> Fraction: ...
+def convert_dec_to_prob(dec: float | Fraction, exact: bool = False) -> float | Fraction:
     """Convert decimal odds to probability.
 
     Arguments:
         dec: Decimal odds (e.g., 2.5 means 2.5 to 1).
+        exact: If True, return an unrounded Fraction (default: False).
 
     Returns:
-        Probability rounded to 4 decimal places.
+        Probability rounded to 4 decimal places, or an exact Fraction.
 
     Example:
         >>> convert_dec_to_prob(2.5)
         0.4
         >>> convert_dec_to_prob(4.0)
         0.25
+        >>> convert_dec_to_prob(Fraction(3, 2), exact=True)
+        Fraction(2, 3)
     """
+    if exact:
+        return 1 / Fraction(dec)
     return round(1 / dec, 4)
 
 
-def convert_prob_to_dec(prob: float) -> float:
+@overload
+def convert_prob_to_dec(
+    prob: float | Fraction, exact: Literal[False] = ...
+) -> float: ...
+@overload
+def convert_prob_to_dec(prob: float | Fraction, exact: Literal[True]) -> Fraction: ...
+def convert_prob_to_dec(
+    prob: float | Fraction, exact: bool = False
+) -> float | Fraction:
     """Convert probability to decimal odds.
 
     Arguments:
         prob: Probability (between 0 and 1).
+        exact: If True, return an unrounded Fraction (default: False).
 
     Returns:
-        Decimal odds rounded to 4 decimal places.
+        Decimal odds rounded to 4 decimal places, or an exact Fraction.
 
     Example:
         >>> convert_prob_to_dec(0.25)
@@ -36,37 +66,55 @@ def convert_prob_to_dec(prob: float) -> float:
         >>> convert_prob_to_dec(0.5)
         2.0
     """
+    if exact:
+        return 1 / Fraction(prob)
     return round(1 / prob, 4)
 
 
-def convert_frac_to_prob(nom: int, denom: int) -> float:
+@overload
+def convert_frac_to_prob(
+    nom: int, denom: int, exact: Literal[False] = ...
+) -> float: ...
+@overload
+def convert_frac_to_prob(nom: int, denom: int, exact: Literal[True]) -> Fraction: ...
+def convert_frac_to_prob(nom: int, denom: int, exact: bool = False) -> float | Fraction:
     """Convert fractional odds to probability.
 
     Arguments:
         nom: Numerator of fractional odds.
         denom: Denominator of fractional odds.
+        exact: If True, return an unrounded Fraction (default: False).
 
     Returns:
-        Probability rounded to 4 decimal places.
+        Probability rounded to 4 decimal places, or an exact Fraction.
 
     Example:
         >>> convert_frac_to_prob(3, 1)  # 3/1 odds
         0.25
         >>> convert_frac_to_prob(1, 1)  # Even odds
         0.5
+        >>> convert_frac_to_prob(5, 2, exact=True)
+        Fraction(2, 7)
     """
+    if exact:
+        return Fraction(denom, nom + denom)
     return round(1 - (nom / (nom + denom)), 4)
 
 
-def convert_frac_to_dec(nom: int, denom: int) -> float:
+@overload
+def convert_frac_to_dec(nom: int, denom: int, exact: Literal[False] = ...) -> float: ...
+@overload
+def convert_frac_to_dec(nom: int, denom: int, exact: Literal[True]) -> Fraction: ...
+def convert_frac_to_dec(nom: int, denom: int, exact: bool = False) -> float | Fraction:
     """Convert fractional odds to decimal odds.
 
     Arguments:
         nom: Numerator of fractional odds.
         denom: Denominator of fractional odds.
+        exact: If True, return an unrounded Fraction (default: False).
 
     Returns:
-        Decimal odds rounded to 4 decimal places.
+        Decimal odds rounded to 4 decimal places, or an exact Fraction.
 
     Example:
         >>> convert_frac_to_dec(3, 1)  # 3/1 odds
@@ -74,21 +122,72 @@ def convert_frac_to_dec(nom: int, denom: int) -> float:
         >>> convert_frac_to_dec(5, 2)  # 5/2 odds
         3.5
     """
+    if exact:
+        return Fraction(nom + denom, denom)
     return round(1 / (1 - (nom / (nom + denom))), 4)
 
 
+def _exact_binomial_fraction(n: int, k: int, p: Fraction) -> Fraction:
+    """P(X = k) for X ~ Binomial(n, p) in exact rational arithmetic."""
+    return math.comb(n, k) * p**k * (1 - p) ** (n - k)
+
+
+def _exact_binomial_decimal(n: int, k: int, p: float) -> float:
+    """P(X = k) in 40-digit decimal arithmetic with an unbounded exponent.
+
+    Used as the float-mode fallback of exact_binomial_probability: it cannot
+    overflow or underflow, and building the binomial coefficient as a
+    40-digit product is far cheaper than exact integers or Fraction powers
+    for large n.
+    """
+    with localcontext(prec=40, Emax=MAX_EMAX, Emin=MIN_EMIN):
+        j = min(k, n - k)
+        n_choose_k = Decimal(1)
+        for i in range(1, j + 1):
+            n_choose_k = n_choose_k * (n - j + i) / i
+        dp = Decimal(p)
+        return float(n_choose_k * dp**k * (1 - dp) ** (n - k))
+
+
+# Largest natural log of a binomial coefficient that still fits in a float
+_MAX_LOG_FLOAT = math.log(2.0**1023)
+
+
+@overload
+def exact_binomial_probability(
+    number_of_trials: int,
+    number_of_successes: int,
+    success_probability: float | Fraction,
+    exact: Literal[False] = ...,
+) -> float: ...
+@overload
 def exact_binomial_probability(
-    number_of_trials: int, number_of_successes: int, success_probability: float
-) -> float:
+    number_of_trials: int,
+    number_of_successes: int,
+    success_probability: float | Fraction,
+    exact: Literal[True],
+) -> Fraction: ...
+def exact_binomial_probability(
+    number_of_trials: int,
+    number_of_successes: int,
+    success_probability: float | Fraction,
+    exact: bool = False,
+) -> float | Fraction:
     """Calculate exact binomial probability P(X = k).
 
     Calculates the probability of exactly k successes in n trials,
     where each trial has probability p of success.
 
+    In float mode the result is computed with floats and only recomputed
+    in high-precision decimal arithmetic when the float computation is
+    ill-conditioned (the binomial coefficient overflows or a power
+    underflows), so the common case stays fast.
+
     Arguments:
         number_of_trials: Total number of trials (n).
         number_of_successes: Number of successes (k).
         success_probability: Probability of success on each trial (p).
+        exact: If True, return an exact Fraction (default: False).
 
     Returns:
         Exact probability P(X = k) where X ~ Binomial(n, p).
@@ -98,22 +197,48 @@ def exact_binomial_probability(
         0.24609375
         >>> exact_binomial_probability(10, 1, 0.33)
         0.1395...
+        >>> exact_binomial_probability(2000, 1000, 0.5)
+        0.0178...
     """
-    n_choose_k = math.factorial(number_of_trials) / (
-        math.factorial(number_of_successes)
-        * math.factorial(number_of_trials - number_of_successes)
-    )
-    exact = (
-        n_choose_k
-        * (success_probability**number_of_successes)
-        * ((1 - success_probability) ** (number_of_trials - number_of_successes))
-    )
-    return exact
-
-
+    n, k = number_of_trials, number_of_successes
+    if exact:
+        return _exact_binomial_fraction(n, k, Fraction(success_probability))
+
+    p = float(success_probability)
+    log_n_choose_k = math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+    if log_n_choose_k > _MAX_LOG_FLOAT:
+        return _exact_binomial_decimal(n, k, p)
+    n_choose_k = float(math.comb(n, k))
+    success_term = p**k
+    failure_term = (1 - p) ** (n - k)
+    # Subnormal (or zero) powers have lost precision
+    if (success_term < sys.float_info.min and p > 0) or (
+        failure_term < sys.float_info.min and p < 1
+    ):
+        return _exact_binomial_decimal(n, k, p)
+    return n_choose_k * success_term * failure_term
+
+
+@overload
+def cumulative_binomial_probabilities(
+    number_of_trials: int,
+    number_of_successes: int,
+    success_probability: float | Fraction,
+    exact: Literal[False] = ...,
+) -> tuple[float, float, float, float]: ...
+@overload
 def cumulative_binomial_probabilities(
-    number_of_trials: int, number_of_successes: int, success_probability: float
-) -> tuple[float, float, float, float]:
+    number_of_trials: int,
+    number_of_successes: int,
+    success_probability: float | Fraction,
+    exact: Literal[True],
+) -> tuple[Fraction, Fraction, Fraction, Fraction]: ...
+def cumulative_binomial_probabilities(
+    number_of_trials: int,
+    number_of_successes: int,
+    success_probability: float | Fraction,
+    exact: bool = False,
+) -> tuple[float, float, float, float] | tuple[Fraction, Fraction, Fraction, Fraction]:
     """Calculate cumulative binomial probabilities.
 
     Calculates P(X < k), P(X <= k), P(X > k), and P(X >= k) for X ~ Binomial(n, p).
@@ -122,29 +247,280 @@ def cumulative_binomial_probabilities(
         number_of_trials: Total number of trials (n).
         number_of_successes: Number of successes (k).
         success_probability: Probability of success on each trial (p).
+        exact: If True, return exact Fractions (default: False).
 
     Returns:
         Tuple of (P(X < k), P(X <= k), P(X > k), P(X >= k)).
 
+    In float mode the terms come from a ratio recurrence rather than one
+    exact_binomial_probability call each, which makes the call O(n) but
+    lets rounding errors add up: the relative error is about n * 1e-16
+    (~2.5e-14 for n = 300) rather than a few units in the last place.
+    Use exact=True where that matters.
+
     Example:
         >>> cumulative_binomial_probabilities(10, 5, 0.5)
         (0.377..., 0.623..., 0.377..., 0.623...)
+        >>> cumulative_binomial_probabilities(2, 1, Fraction(1, 2), exact=True)
+        (Fraction(1, 4), Fraction(3, 4), Fraction(1, 4), Fraction(3, 4))
+    """
+    if exact:
+        return _cumulative_binomial_fractions(
+            number_of_trials, number_of_successes, Fraction(success_probability)
+        )
+
+    n, k = number_of_trials, number_of_successes
+    p = float(success_probability)
+    if p <= 0 or p >= 1:
+        # All the mass is on 0 or on n successes
+        mode = 0 if p <= 0 else n
+        return (float(mode < k), float(mode <= k), float(mode > k), float(mode >= k))
+
+    # The pmf is log-concave, so no term is smaller than both end terms; if
+    # those are normal floats, the whole recurrence stays in float range
+    first = (1 - p) ** n
+    if first >= sys.float_info.min and p**n >= sys.float_info.min:
+        below, at, above = _cumulative_binomial_terms(n, k, first, p / (1 - p))
+        return below, below + at, above, above + at
+
+    # Otherwise in 40-digit decimal arithmetic with an unbounded exponent
+    with localcontext(prec=40, Emax=MAX_EMAX, Emin=MIN_EMIN):
+        dp = Decimal(p)
+        d_below, d_at, d_above = _cumulative_binomial_terms(
+            n, k, (1 - dp) ** n, dp / (1 - dp)
+        )
+        return (
+            float(d_below),
+            float(d_below + d_at),
+            float(d_above),
+            float(d_above + d_at),
+        )
+
+
+_Number = TypeVar("_Number", float, Decimal)
+
+
+def _cumulative_binomial_terms(
+    n: int, k: int, first: _Number, odds: _Number
+) -> tuple[_Number, _Number, _Number]:
+    """Sum P(X < k), P(X = k) and P(X > k) from P(X = 0) and p / (1 - p).
+
+    The terms come from the ratio recurrence
+    P(X = i + 1) = P(X = i) * (n - i) / (i + 1) * p / (1 - p), so the whole
+    distribution costs O(n) operations.
+    """
+    below = at = above = first * 0
+    term = first
+    for i in range(n + 1):
+        if i < k:
+            below += term
+        elif i == k:
+            at = term
+        else:
+            above += term
+        term = term * (n - i) / (i + 1) * odds
+    return below, at, above
+
+
+def _cumulative_binomial_fractions(
+    n: int, k: int, p: Fraction
+) -> tuple[Fraction, Fraction, Fraction, Fraction]:
+    """Exact cumulative binomial probabilities (internal helper)."""
+    below = Fraction(0)  # P(X < k)
+    at = Fraction(0)  # P(X = k)
+    above = Fraction(0)  # P(X > k)
+    for i in range(n + 1):
+        term = _exact_binomial_fraction(n, i, p)
+        if i < k:
+            below += term
+        elif i == k:
+            at = term
+        else:
+            above += term
+    return below, below + at, above, above + at
+
+
+def book_overround(decimal_odds: Sequence[float]) -> float:
+    """Calculate the overround (bookmaker margin) of a market.
+
+    Arguments:
+        decimal_odds: Decimal odds of every selection in the market.
+
+    Returns:
+        Sum of implied probabilities minus 1 (e.g., 0.05 for a 5% margin).
+
+    Example:
+        >>> round(book_overround([1.9, 1.9]), 4)
+        0.0526
+    """
+    return math.fsum(1 / odds for odds in decimal_odds) - 1
+
+
+def _implied_probabilities(books: Sequence[Sequence[float]]) -> list[list[float]]:
+    """Convert books of decimal odds to raw implied probabilities."""
+    implied = []
+    for book in books:
+        if not book:
+            raise ValueError("Every market must have at least one selection")
+        if any(odds <= 1 for odds in book):
+            raise ValueError("Decimal odds must be greater than 1")
+        implied.append([1 / odds for odds in book])
+    return implied
+
+
+def _proportional(implied: list[list[float]]) -> list[list[float]]:
+    """Scale implied probabilities so that each market sums to 1."""
+    result = []
+    for pis in implied:
+        total = math.fsum(pis)
+        result.append([pi / total for pi in pis])
+    return result
+
+
+def _shin_probabilities(pis: list[float], total: float, z: float) -> list[float]:
+    """Shin probabilities for a given insider-trading proportion z."""
+    return [
+        (math.sqrt(z * z + 4 * (1 - z) * pi * pi / total) - z) / (2 * (1 - z))
+        for pi in pis
+    ]
+
+
+def _shin(
+    implied: list[list[float]], tolerance: float, max_iterations: int
+) -> list[list[float]]:
+    """Solve Shin's model for every market, bisecting all markets together."""
+    totals = [math.fsum(pis) for pis in implied]
+    low = [0.0] * len(implied)
+    high = [1.0] * len(implied)
+    # Markets without overround have no insider proportion to solve for
+    active = [i for i, total in enumerate(totals) if total > 1]
+    for i in range(len(implied)):
+        if totals[i] <= 1:
+            high[i] = 0.0
+    for _ in range(max_iterations):
+        if not active:
+            break
+        still_active = []
+        for i in active:
+            z = (low[i] + high[i]) / 2
+            if math.fsum(_shin_probabilities(implied[i], totals[i], z)) > 1:
+                low[i] = z
+            else:
+                high[i] = z
+            if high[i] - low[i] > tolerance:
+                still_active.append(i)
+        active = still_active
+
+    result = []
+    for i, pis in enumerate(implied):
+        probs = _shin_probabilities(pis, totals[i], (low[i] + high[i]) / 2)
+        total = math.fsum(probs)
+        result.append([p / total for p in probs])
+    return result
+
+
+def _power(
+    implied: list[list[float]], tolerance: float, max_iterations: int
+) -> list[list[float]]:
+    """Solve the power method for every market with Newton steps in lockstep."""
+    exponents = [1.0] * len(implied)
+    active = list(range(len(implied)))
+    for _ in range(max_iterations):
+        if not active:
+            break
+        still_active = []
+        for i in active:
+            k = exponents[i]
+            powered = [pi**k for pi in implied[i]]
+            value = math.fsum(powered) - 1
+            slope = math.fsum(p * math.log(pi) for p, pi in zip(powered, implied[i]))
+            if slope == 0:
+                continue
+            step = value / slope
+            exponents[i] = k - step
+            if abs(step) > tolerance:
+                still_active.append(i)
+        active = still_active
+
+    result = []
+    for k, pis in zip(exponents, implied):
+        probs = [pi**k for pi in pis]
+        total = math.fsum(probs)
+        result.append([p / total for p in probs])
+    return result
+
+
+# Solvers of the iterative methods; "proportional" needs none
+_ITERATIVE_SOLVERS = {"shin": _shin, "power": _power}
+_OVERROUND_METHODS = sorted(["proportional", *_ITERATIVE_SOLVERS])
+
+
+def remove_overround_markets(
+    books: Sequence[Sequence[float]],
+    method: str = "proportional",
+    tolerance: float = 1e-12,
+    max_iterations: int = 100,
+) -> list[list[float]]:
+    """Remove the overround from many markets in one pass.
+
+    Methods:
+        proportional: Scale implied probabilities by the book total.
+        shin: Shin's model of insider trading; favourite-longshot aware.
+        power: Raise implied probabilities to a common power k.
+
+    The iterative methods (shin, power) advance the solver of every
+    unconverged market together, dropping markets as they converge.
+
+    Arguments:
+        books: Sequence of markets, each a sequence of decimal odds.
+        method: One of "proportional", "shin" or "power" (default: "proportional").
+        tolerance: Convergence tolerance of the iterative solvers (shin and
+            power; proportional is exact).
+        max_iterations: Maximum number of solver iterations.
+
+    Returns:
+        Fair probabilities per market, each market summing to 1 (not rounded).
+
+    Raises:
+        ValueError: If the method is unknown, a market is empty or odds are <= 1.
+
+    Example:
+        >>> remove_overround_markets([[1.9, 1.9], [1.5, 3.0, 6.0]])
+        [[0.5, 0.5], [0.5714..., 0.2857..., 0.1428...]]
+    """
+    if method == "proportional":
+        return _proportional(_implied_probabilities(books))
+    try:
+        solver = _ITERATIVE_SOLVERS[method]
+    except KeyError:
+        raise ValueError(
+            f"Unknown method {method!r}; expected one of {_OVERROUND_METHODS}"
+        ) from None
+    return solver(_implied_probabilities(books), tolerance, max_iterations)
+
+
+def remove_overround(
+    decimal_odds: Sequence[float],
+    method: str = "proportional",
+    tolerance: float = 1e-12,
+    max_iterations: int = 100,
+) -> list[float]:
+    """Remove the overround from a single market.
+
+    Arguments:
+        decimal_odds: Decimal odds of every selection in the market.
+        method: One of "proportional", "shin" or "power" (default: "proportional").
+        tolerance: Convergence tolerance of the iterative solvers (shin and
+            power; proportional is exact).
+        max_iterations: Maximum number of solver iterations.
+
+    Returns:
+        Fair probabilities summing to 1 (not rounded).
+
+    Example:
+        >>> remove_overround([1.9, 1.9])
+        [0.5, 0.5]
     """
-    X_lt_x = 0.0
-    X_lt_eq_x = 0.0
-    X_gt_x = 0.0
-    X_gt_eq_x = 0.0
-
-    for i in range(number_of_trials + 1):
-        exact = exact_binomial_probability(number_of_trials, i, success_probability)
-        if i < number_of_successes:
-            X_lt_x += exact
-            X_lt_eq_x += exact
-        elif i == number_of_successes:
-            X_lt_eq_x += exact
-            X_gt_eq_x += exact
-        elif i > number_of_successes:
-            X_gt_x += exact
-            X_gt_eq_x += exact
-
-    return X_lt_x, X_lt_eq_x, X_gt_x, X_gt_eq_x
+    return remove_overround_markets([decimal_odds], method, tolerance, max_iterations)[
+        0
+    ]
@@ -0,0 +1,229 @@
+"""Monte Carlo Simulation Utilities"""
+
+import hashlib
+import random
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+
+@dataclass(frozen=True)
+class SimulationSummary:
+    """Running summary statistics of simulated outcomes.
+
+    Attributes:
+        count: Number of simulated outcomes.
+        mean: Mean outcome.
+        m2: Sum of squared deviations from the mean.
+        minimum: Smallest outcome seen.
+        maximum: Largest outcome seen.
+    """
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    minimum: float = float("inf")
+    maximum: float = float("-inf")
+
+    @property
+    def variance(self) -> float:
+        """Sample variance of the outcomes (0.0 for fewer than 2 outcomes)."""
+        if self.count < 2:
+            return 0.0
+        return self.m2 / (self.count - 1)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation of the outcomes."""
+        return self.variance**0.5
+
+    def merge(self, other: "SimulationSummary") -> "SimulationSummary":
+        """Combine two summaries as if their outcomes were pooled.
+
+        Arguments:
+            other: Summary of another, disjoint set of outcomes.
+
+        Returns:
+            Summary of both sets of outcomes.
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            return other
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        return SimulationSummary(
+            count=count,
+            mean=self.mean + delta * other.count / count,
+            m2=self.m2 + other.m2 + delta * delta * self.count * other.count / count,
+            minimum=min(self.minimum, other.minimum),
+            maximum=max(self.maximum, other.maximum),
+        )
+
+
+def _summarize(values: Sequence[float]) -> SimulationSummary:
+    """Summarize one batch of outcomes (internal helper)."""
+    if not values:
+        return SimulationSummary()
+    mean = sum(values) / len(values)
+    return SimulationSummary(
+        count=len(values),
+        mean=mean,
+        m2=sum((x - mean) ** 2 for x in values),
+        minimum=min(values),
+        maximum=max(values),
+    )
+
+
+def _stream_seed(seed: int, index: int) -> int:
+    """Derive the seed of an independent random stream for one batch."""
+    digest = hashlib.sha256(f"{seed}:{index}".encode("ascii")).digest()
+    return int.from_bytes(digest[:16], "big")
+
+
+def _binomial_batch(
+    number_of_trials: int, success_probability: float, size: int, seed: int
+) -> SimulationSummary:
+    """Draw one block of binomial outcomes (internal helper)."""
+    draw = random.Random(seed).binomialvariate
+    return _summarize(
+        [draw(number_of_trials, success_probability) for _ in range(size)]
+    )
+
+
+def _portfolio_batch(
+    bets: Sequence[tuple[float, float, float]], size: int, seed: int
+) -> SimulationSummary:
+    """Draw one block of portfolio profits (internal helper)."""
+    uniform = random.Random(seed).random
+    profits = [0.0] * size
+    for decimal_odds, win_probability, stake in bets:
+        win = stake * (decimal_odds - 1)
+        for i in range(size):
+            profits[i] += win if uniform() < win_probability else -stake
+    return _summarize(profits)
+
+
+def _batches(
+    number_of_simulations: int, batch_size: int, seed: int | None
+) -> Iterator[tuple[int, int]]:
+    """Yield (size, stream seed) for every batch of a simulation run."""
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    for index, start in enumerate(range(0, number_of_simulations, batch_size)):
+        yield min(batch_size, number_of_simulations - start), _stream_seed(seed, index)
+
+
+def _run(
+    worker: Callable[..., SimulationSummary],
+    tasks: Iterable[tuple[Any, ...]],
+    workers: int | None,
+) -> Iterator[SimulationSummary]:
+    """Run batches and yield the running summary after each one.
+
+    Batches are merged in submission order, so the results do not depend on
+    the number of workers.
+    """
+    # Imported here: the process pool machinery costs ~45 ms to import
+    from stavroslib._parallel import pool_starmap
+
+    running = SimulationSummary()
+    for summary in pool_starmap(worker, tasks, workers):
+        running = running.merge(summary)
+        yield running
+
+
+def simulate_binomial(
+    number_of_trials: int,
+    success_probability: float,
+    number_of_simulations: int,
+    batch_size: int = 100_000,
+    seed: int | None = None,
+    workers: int | None = 1,
+) -> Iterator[SimulationSummary]:
+    """Simulate the number of successes X ~ Binomial(n, p).
+
+    Outcomes are drawn in blocks of ``batch_size``; every block uses its own
+    random stream derived from ``seed``, so a seeded run gives the same
+    summaries whatever the number of workers. Only the running summary is
+    kept, so memory stays flat however many simulations are run.
+
+    Arguments:
+        number_of_trials: Number of trials per simulation (n).
+        success_probability: Probability of success on each trial (p).
+        number_of_simulations: Number of simulated outcomes to draw.
+        batch_size: Number of outcomes drawn per block (default: 100000).
+        seed: Seed for reproducible runs (default: random).
+        workers: Number of worker processes; None uses all CPUs (default: 1).
+
+    Returns:
+        Iterator of running SimulationSummary objects, one per block.
+
+    Example:
+        >>> *_, summary = simulate_binomial(10, 0.5, 1_000_000, seed=42)
+        >>> round(summary.mean, 1)
+        5.0
+    """
+    if not 0 <= success_probability <= 1:
+        raise ValueError("success_probability must be between 0 and 1")
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+    tasks = (
+        (number_of_trials, success_probability, size, stream_seed)
+        for size, stream_seed in _batches(number_of_simulations, batch_size, seed)
+    )
+    return _run(_binomial_batch, tasks, workers)
+
+
+def simulate_portfolio(
+    bets: Sequence[tuple[float, float, float]],
+    number_of_simulations: int,
+    batch_size: int = 100_000,
+    seed: int | None = None,
+    workers: int | None = 1,
+) -> Iterator[SimulationSummary]:
+    """Simulate the total profit of a portfolio of independent bets.
+
+    Each bet is a Bernoulli trial: it wins ``stake * (decimal_odds - 1)``
+    with probability ``win_probability`` and loses ``stake`` otherwise.
+
+    Arguments:
+        bets: Sequence of (decimal_odds, win_probability, stake) tuples.
+        number_of_simulations: Number of simulated portfolio outcomes.
+        batch_size: Number of outcomes drawn per block (default: 100000).
+        seed: Seed for reproducible runs (default: random).
+        workers: Number of worker processes; None uses all CPUs (default: 1).
+
+    Returns:
+        Iterator of running SimulationSummary objects of the profit, one per
+        block.
+
+    Example:
+        >>> bets = [(2.0, 0.5, 10.0), (3.0, 0.4, 5.0)]
+        >>> *_, summary = simulate_portfolio(bets, 100_000, seed=1)
+        >>> round(summary.mean)
+        1
+    """
+    bets = [(float(o), float(p), float(s)) for o, p, s in bets]
+    if any(not 0 <= p <= 1 for _, p, _ in bets):
+        raise ValueError("win_probability must be between 0 and 1")
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+    tasks = (
+        (bets, size, stream_seed)
+        for size, stream_seed in _batches(number_of_simulations, batch_size, seed)
+    )
+    return _run(_portfolio_batch, tasks, workers)
+
+
+def final_summary(summaries: Iterable[SimulationSummary]) -> SimulationSummary:
+    """Exhaust a simulation and return its last running summary.
+
+    Arguments:
+        summaries: Iterator returned by one of the simulate_* functions.
+
+    Returns:
+        Summary of all simulated outcomes (empty if nothing was simulated).
+    """
+    last = deque(summaries, maxlen=1)
+    return last[0] if last else SimulationSummary()
@@ -0,0 +1,113 @@
+"""Tests for streaming statistics accumulators."""
+
+import random
+
+import pytest
+
+from stavroslib.accumulators import EwmaHitRate, HitRateCounter, RunningBinomialTest
+from stavroslib.probability import (
+    cumulative_binomial_probabilities,
+    exact_binomial_probability,
+)
+
+
+class TestHitRateCounter:
+    """Test the success/trial counter."""
+
+    def test_update(self):
+        """Test single updates."""
+        counter = HitRateCounter()
+        assert counter.hit_rate == 0.0
+        for outcome in [True, False, True, True]:
+            counter.update(outcome)
+        assert counter.successes == 3
+        assert counter.trials == 4
+        assert counter.hit_rate == 0.75
+
+    def test_update_many(self):
+        """Test bulk updates."""
+        counter = HitRateCounter(1, 2)
+        counter.update_many(4, 8)
+        assert counter.hit_rate == 0.5
+
+    def test_invalid_counts(self):
+        """Test that more successes than trials is rejected."""
+        with pytest.raises(ValueError):
+            HitRateCounter(3, 2)
+        with pytest.raises(ValueError):
+            HitRateCounter().update_many(2, 1)
+
+
+class TestRunningBinomialTest:
+    """Test incremental binomial tail p-values."""
+
+    @pytest.mark.parametrize(
+        "p, true_rate", [(0.3, 0.3), (0.5, 0.9), (0.2, 0.05), (0.01, 0.02)]
+    )
+    def test_matches_cumulative(self, p, true_rate):
+        """Test p-values match recomputation from the full history."""
+        rng = random.Random(1)
+        test = RunningBinomialTest(p)
+        for i in range(300):
+            test.update(rng.random() < true_rate)
+            if i % 30 == 0 or i == 299:
+                n, k = test.trials, test.successes
+                _, lte, _, gte = cumulative_binomial_probabilities(n, k, p)
+                assert test.p_value_greater == pytest.approx(gte, abs=1e-12)
+                assert test.p_value_less == pytest.approx(lte, abs=1e-12)
+                assert test.probability == pytest.approx(
+                    exact_binomial_probability(n, k, p), rel=1e-9
+                )
+
+    def test_initial_state(self):
+        """Test p-values before any trial."""
+        test = RunningBinomialTest(0.5)
+        assert test.p_value_greater == 1.0
+        assert test.p_value_less == 1.0
+        assert test.hit_rate == 0.0
+
+    def test_long_history_stays_finite(self):
+        """Test long one-sided histories do not overflow or underflow badly."""
+        test = RunningBinomialTest(0.5)
+        for _ in range(5_000):
+            test.update(True)
+        assert test.p_value_greater == 0.0
+        assert test.p_value_less == 1.0
+
+    def test_invalid_probability(self):
+        """Test that degenerate null probabilities are rejected."""
+        with pytest.raises(ValueError):
+            RunningBinomialTest(0.0)
+        with pytest.raises(ValueError):
+            RunningBinomialTest(1.0)
+
+
+class TestEwmaHitRate:
+    """Test the exponentially weighted hit rate."""
+
+    def test_no_decay_equals_plain_rate(self):
+        """Test decay=1 gives the ordinary hit rate."""
+        ewma = EwmaHitRate(1.0)
+        for outcome in [True, False, False, True]:
+            ewma.update(outcome)
+        assert ewma.hit_rate == 0.5
+        assert ewma.effective_trials == 4
+
+    def test_recent_outcomes_weigh_more(self):
+        """Test recent outcomes dominate the weighted rate."""
+        ewma = EwmaHitRate(0.5)
+        for outcome in [False] * 10 + [True] * 3:
+            ewma.update(outcome)
+        assert ewma.hit_rate > 0.8
+
+    def test_from_halflife(self):
+        """Test halflife construction."""
+        ewma = EwmaHitRate.from_halflife(10)
+        assert ewma.decay**10 == pytest.approx(0.5)
+
+    def test_invalid_decay(self):
+        """Test that decay outside (0, 1] is rejected."""
+        with pytest.raises(ValueError):
+            EwmaHitRate(0.0)
+        with pytest.raises(ValueError):
+            EwmaHitRate.from_halflife(0)
@@ -1,4 +1,6 @@
-from stavroslib.dict import merge_dicts
+import pytest
+
+from stavroslib.dict import LayeredConfig, merge_dicts
 
 
 def test_merge_dicts():
@@ -28,3 +30,60 @@ def test_merge_dicts_overlapping_keys():
     d2 = {"b": 3, "c": 4}
     result = merge_dicts(d1, d2)
     assert result == {"a": 1, "b": 3, "c": 4}  # d2 overwrites d1
+
+
+class TestLayeredConfig:
+    defaults = {"db": {"host": "localhost", "port": 5432, "opts": {"ssl": False}}}
+    overrides = {"db": {"host": "db.internal", "opts": {"timeout": 5}}, "debug": True}
+
+    def test_deep_merge(self):
+        config = LayeredConfig(self.defaults, self.overrides)
+        assert config["db"]["host"] == "db.internal"
+        assert config["db"]["port"] == 5432
+        assert dict(config["db"]["opts"]) == {"ssl": False, "timeout": 5}
+        assert config["debug"] is True
+        assert list(config) == ["db", "debug"]
+        assert len(config) == 2
+        assert "debug" in config and "missing" not in config
+
+    def test_missing_key(self):
+        config = LayeredConfig(self.defaults)
+        with pytest.raises(KeyError):
+            config["missing"]
+        assert config.get("missing") is None
+
+    def test_scalars_and_lists_replace_lower_layers(self):
+        config = LayeredConfig(
+            {"db": {"host": "a"}, "hosts": [1, 2], "mode": {"x": 1}},
+            {"db": "sqlite://", "hosts": [3], "mode": {"y": 2}},
+            {"db": {"port": 1}},
+        )
+        # A mapping only merges down to the first non-mapping value
+        assert config["db"].to_dict() == {"port": 1}
+        assert config["hosts"] == [3]
+        assert config["mode"].to_dict() == {"x": 1, "y": 2}
+
+    def test_to_dict_matches_merge(self):
+        config = LayeredConfig(self.defaults, self.overrides)
+        assert config.to_dict() == {
+            "db": {
+                "host": "db.internal",
+                "port": 5432,
+                "opts": {"ssl": False, "timeout": 5},
+            },
+            "debug": True,
+        }
+        flat = LayeredConfig({"a": 1, "b": 2}, {"b": 3, "c": 4})
+        assert flat.to_dict() == merge_dicts({"a": 1, "b": 2}, {"b": 3, "c": 4})
+
+    def test_views_are_cached_and_not_copied(self):
+        big = {"items": list(range(1000))}
+        config = LayeredConfig({"data": big}, {"other": 1})
+        assert config["data"] is config["data"]
+        assert config["data"]["items"] is big["items"]
+
+    def test_with_layer(self):
+        config = LayeredConfig(self.defaults)
+        updated = config.with_layer({"db": {"port": 6543}})
+        assert updated["db"]["port"] == 6543
+        assert config["db"]["port"] == 5432
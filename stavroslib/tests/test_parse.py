@@ -1,7 +1,32 @@
 import os
+import subprocess
+import sys
 import tempfile
-
-from stavroslib.parse import read_env, read_yaml
+import time
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from types import MappingProxyType
+from typing import Any
+
+import pytest
+import yaml
+
+from stavroslib.parse import (
+    ConfigCache,
+    ConfigWatcher,
+    SchemaError,
+    compile_schema,
+    config_cache,
+    iter_yaml,
+    read_cached,
+    read_env,
+    read_layered,
+    read_many,
+    read_toml,
+    read_yaml,
+    yaml_backend,
+)
 
 
 def test_read_yaml_simple():
@@ -87,6 +112,99 @@ def test_read_yaml_empty():
         os.unlink(temp_path)
 
 
+def test_read_yaml_matches_pure_python_loader(tmp_path):
+    content = """
+defaults: &defaults
+  retries: 3
+  timeout: 1.5
+service:
+  <<: *defaults
+  name: "api"
+  started: 2024-01-15
+  enabled: yes
+  ports: [80, 443]
+  motd: |
+    multi
+    line
+"""
+    path = tmp_path / "config.yaml"
+    path.write_text(content, encoding="utf8")
+    result = read_yaml(str(path))
+    assert result == yaml.load(content, Loader=yaml.FullLoader)
+    assert result is not None
+    assert result["service"]["retries"] == 3
+    assert result["service"]["started"] == date(2024, 1, 15)
+
+
+def test_read_yaml_safe_by_default(tmp_path):
+    path = tmp_path / "tuple.yaml"
+    path.write_text("point: !!python/tuple [1, 2]\n", encoding="utf8")
+    with pytest.raises(yaml.YAMLError):
+        read_yaml(str(path))
+    assert read_yaml(str(path), safe=False) == {"point": (1, 2)}
+
+
+def test_yaml_backend():
+    expected = "libyaml" if yaml.__with_libyaml__ else "python"
+    assert yaml_backend() == expected
+
+
+def test_read_yaml_pure_python_fallback(tmp_path, monkeypatch):
+    monkeypatch.delattr(yaml, "CSafeLoader", raising=False)
+    path = tmp_path / "config.yaml"
+    path.write_text("name: Stavros\n", encoding="utf8")
+    assert yaml_backend() == "python"
+    assert read_yaml(str(path)) == {"name": "Stavros"}
+
+
+def test_import_does_not_load_parser_backends():
+    code = (
+        "import sys, stavroslib.parse; "
+        "print(sorted({'yaml', 'tomllib', 'reportlab', 'requests'} & set(sys.modules)))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "[]"
+
+
+def test_package_exposes_submodules_lazily():
+    code = (
+        "import stavroslib; "
+        "print(stavroslib.parse.read_env.__name__, "
+        "stavroslib.probability.__name__, "
+        "stavroslib.read_toml is stavroslib.parse.read_toml, "
+        "hasattr(stavroslib, 'no_such_module'))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.split() == ["read_env", "stavroslib.probability", "True", "False"]
+
+
+def test_iter_yaml_yields_every_document(tmp_path):
+    path = tmp_path / "events.yaml"
+    path.write_text("id: 1\n---\nid: 2\ntags: [a, b]\n---\n---\n- x\n", encoding="utf8")
+    documents = iter_yaml(str(path))
+    assert next(documents) == {"id": 1}
+    assert list(documents) == [{"id": 2, "tags": ["a", "b"]}, None, ["x"]]
+
+
+def test_iter_yaml_is_lazy(tmp_path):
+    path = tmp_path / "events.yaml"
+    path.write_text("id: 1\n---\nid: [unclosed\n", encoding="utf8")
+    documents = iter_yaml(str(path))
+    assert next(documents) == {"id": 1}
+    with pytest.raises(yaml.YAMLError):
+        next(documents)
+
+
+def test_iter_yaml_empty_file(tmp_path):
+    path = tmp_path / "empty.yaml"
+    path.write_text("", encoding="utf8")
+    assert list(iter_yaml(str(path))) == []
+
+
 class TestReadEnv:
     def test_simple_key_value(self):
         content = "KEY=value\n"
@@ -258,3 +376,492 @@ DB_PASS="secret password"
             assert result["DB_PASS"] == "secret password"
         finally:
             os.unlink(temp_path)
+
+
+class TestEnvSyntax:
+    @staticmethod
+    def parse(tmp_path, content, **kwargs):
+        path = tmp_path / ".env"
+        path.write_text(content, encoding="utf8")
+        return read_env(str(path), **kwargs)
+
+    def test_multiline_quoted_values(self, tmp_path):
+        content = "A='line 1\n  line 2'\nB=\"x \n y\" # comment\nC=after\n"
+        assert self.parse(tmp_path, content) == {
+            "A": "line 1\n  line 2",
+            "B": "x \n y",
+            "C": "after",
+        }
+
+    def test_unclosed_quote_is_read_as_unquoted(self, tmp_path):
+        assert self.parse(tmp_path, "A='open\nB=2\n") == {"A": "'open", "B": "2"}
+
+    def test_escapes_in_double_quotes_only(self, tmp_path):
+        content = 'A="tab\\tnew\\nq\\"\\\\"\nB=\'raw\\n\'\nC=raw\\n\n'
+        assert self.parse(tmp_path, content) == {
+            "A": 'tab\tnew\nq"\\',
+            "B": "raw\\n",
+            "C": "raw\\n",
+        }
+
+    def test_quoted_value_with_comment(self, tmp_path):
+        content = "A='a # b' # comment\nB=\"c\" # comment\n"
+        assert self.parse(tmp_path, content) == {"A": "a # b", "B": "c"}
+
+    def test_text_after_closing_quote(self, tmp_path):
+        content = "A='it''s'\nB=\"a\" \"$b\\n\"\nC='x\ny' z\nD=1\n"
+        expected = {"A": "it''s", "B": 'a" "$b\\n', "C": "'x", "D": "1"}
+        assert self.parse(tmp_path, content) == expected
+        assert self.parse(tmp_path, content, interpolate=True) == expected
+
+    def test_hash_inside_unquoted_value(self, tmp_path):
+        content = "URL=http://host/#anchor\nEMPTY=# only a comment\n"
+        assert self.parse(tmp_path, content) == {
+            "URL": "http://host/#anchor",
+            "EMPTY": "",
+        }
+
+    def test_interpolation(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("STAVROSLIB_TEST_HOME", "/home/me")
+        monkeypatch.delenv("STAVROSLIB_TEST_UNSET", raising=False)
+        content = (
+            "HOST=localhost\n"
+            "URL=http://${HOST}:$PORT/x\n"
+            "PORT=80\n"
+            "DIR=$STAVROSLIB_TEST_HOME/app\n"
+            "LEVEL=${STAVROSLIB_TEST_UNSET:-info}\n"
+            "MISSING=[$STAVROSLIB_TEST_UNSET]\n"
+            "LITERAL='$HOST'\n"
+            'ESCAPED="\\$HOST"\n'
+        )
+        assert self.parse(tmp_path, content, interpolate=True) == {
+            "HOST": "localhost",
+            "URL": "http://localhost:80/x",
+            "PORT": "80",
+            "DIR": "/home/me/app",
+            "LEVEL": "info",
+            "MISSING": "[]",
+            "LITERAL": "$HOST",
+            "ESCAPED": "$HOST",
+        }
+
+    def test_reference_to_earlier_definition(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PATH", "/bin")
+        content = "A=1\nB=$A\nA=2\nC=$A\nPATH=$PATH:/opt\n"
+        assert self.parse(tmp_path, content, interpolate=True) == {
+            "A": "2",
+            "B": "1",
+            "C": "2",
+            "PATH": "/bin:/opt",
+        }
+
+    def test_cycle(self, tmp_path):
+        with pytest.raises(ValueError, match="cycle"):
+            self.parse(tmp_path, "A=$B\nB=${A}\n", interpolate=True)
+
+    def test_interpolation_disabled_by_default(self, tmp_path):
+        content = 'A=1\nB=$A\nC="${A}\\n"\nPASSWORD=abc$def\n'
+        expected = {"A": "1", "B": "$A", "C": "${A}\n", "PASSWORD": "abc$def"}
+        assert self.parse(tmp_path, content) == expected
+        assert self.parse(tmp_path, content, interpolate=False) == expected
+
+
+class TestConfigCache:
+    @staticmethod
+    def counting_reader(calls):
+        def reader(path):
+            calls.append(path)
+            return read_toml(path)
+
+        return reader
+
+    def test_hits_until_file_changes(self, tmp_path):
+        path = tmp_path / "app.toml"
+        path.write_text('name = "a"\n')
+        cache = ConfigCache()
+        calls = []
+        reader = self.counting_reader(calls)
+        assert cache.read(str(path), reader) == {"name": "a"}
+        assert cache.read(str(path), reader) == {"name": "a"}
+        assert (cache.hits, cache.misses, len(calls)) == (1, 1, 1)
+
+        path.write_text('name = "bb"\n')
+        assert cache.read(str(path), reader) == {"name": "bb"}
+        assert (cache.hits, cache.misses, len(calls)) == (1, 2, 2)
+
+    def test_mutable_results_are_private_copies(self, tmp_path):
+        path = tmp_path / "app.toml"
+        path.write_text("[db]\nports = [1, 2]\n")
+        cache = ConfigCache()
+        first = cache.read(str(path), read_toml)
+        first["db"]["ports"].append(3)
+        assert cache.read(str(path), read_toml) == {"db": {"ports": [1, 2]}}
+
+    def test_immutable_results(self, tmp_path):
+        path = tmp_path / "app.toml"
+        path.write_text("[db]\nports = [1, 2]\n")
+        cache = ConfigCache()
+        result = cache.read(str(path), read_toml, immutable=True)
+        assert result["db"]["ports"] == (1, 2)
+        with pytest.raises(TypeError):
+            result["db"]["host"] = "x"
+        assert cache.read(str(path), read_toml, immutable=True) is result
+
+    def test_lru_eviction(self, tmp_path):
+        cache = ConfigCache(max_entries=2)
+        paths = []
+        for name in "abc":
+            path = tmp_path / f"{name}.toml"
+            path.write_text(f'name = "{name}"\n')
+            paths.append(str(path))
+        cache.read(paths[0], read_toml)
+        cache.read(paths[1], read_toml)
+        cache.read(paths[0], read_toml)  # a is now most recently used
+        cache.read(paths[2], read_toml)  # evicts b
+        assert len(cache) == 2
+        cache.read(paths[0], read_toml)
+        cache.read(paths[1], read_toml)
+        assert (cache.hits, cache.misses) == (2, 4)
+
+    def test_invalidate_and_clear(self, tmp_path):
+        path = tmp_path / "app.toml"
+        path.write_text('name = "a"\n')
+        cache = ConfigCache()
+        cache.read(str(path), read_toml)
+        cache.invalidate(str(path))
+        assert len(cache) == 0
+        cache.read(str(path), read_toml)
+        cache.clear()
+        assert (len(cache), cache.hits, cache.misses) == (0, 0, 0)
+
+    def test_concurrent_reads(self, tmp_path):
+        path = tmp_path / "app.toml"
+        path.write_text('name = "a"\n')
+        cache = ConfigCache()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(
+                executor.map(lambda _: cache.read(str(path), read_toml), range(200))
+            )
+        assert all(result == {"name": "a"} for result in results)
+        assert cache.hits + cache.misses == 200
+
+    def test_read_cached_dispatches_by_file_name(self, tmp_path):
+        (tmp_path / "a.toml").write_text("x = 1\n")
+        (tmp_path / "a.yml").write_text("x: 2\n")
+        (tmp_path / ".env").write_text("X=3\n")
+        assert read_cached(str(tmp_path / "a.toml")) == {"x": 1}
+        assert read_cached(str(tmp_path / "a.yml")) == {"x": 2}
+        assert read_cached(str(tmp_path / ".env"), immutable=True) == {"X": "3"}
+        with pytest.raises(ValueError):
+            read_cached(str(tmp_path / "a.ini"))
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestConfigWatcher:
+    @pytest.mark.parametrize("use_inotify", [True, False])
+    def test_reloads_on_change(self, tmp_path, use_inotify):
+        path = tmp_path / "app.toml"
+        path.write_text("port = 1\n")
+        received = []
+        watcher = ConfigWatcher(str(path), poll_interval=0.05, use_inotify=use_inotify)
+        watcher.subscribe(received.append)
+        assert watcher.snapshot == {"port": 1}
+        with watcher:
+            path.write_text("port = 22\n")
+            assert wait_for(lambda: watcher.snapshot == {"port": 22})
+            # Atomic replace, as editors do
+            replacement = tmp_path / "app.toml.tmp"
+            replacement.write_text("port = 333\n")
+            os.replace(replacement, path)
+            assert wait_for(lambda: watcher.snapshot == {"port": 333})
+        assert received[-1] == {"port": 333}
+
+    def test_polls_without_inotify_on_other_platforms(self, tmp_path, monkeypatch):
+        import ctypes
+
+        probes = []
+        monkeypatch.setattr(sys, "platform", "win32")
+        monkeypatch.setattr(ctypes, "CDLL", lambda *args, **kwargs: probes.append(1))
+        path = tmp_path / "app.toml"
+        path.write_text("port = 1\n")
+        with ConfigWatcher(str(path), poll_interval=0.05) as watcher:
+            path.write_text("port = 22\n")
+            assert wait_for(lambda: watcher.snapshot == {"port": 22})
+        assert probes == []
+
+    def test_failing_error_handler_keeps_watching(self, tmp_path):
+        path = tmp_path / "app.toml"
+        path.write_text("port = 1\n")
+        failures = []
+
+        def on_error(exc):
+            failures.append(exc)
+            raise RuntimeError("handler failed")
+
+        watcher = ConfigWatcher(str(path), poll_interval=0.05, on_error=on_error)
+        with watcher:
+            path.write_text("port = [unclosed\n")
+            assert wait_for(lambda: failures)
+            assert isinstance(watcher.last_error, RuntimeError)
+            path.write_text("port = 22\n")
+            assert wait_for(lambda: watcher.snapshot == {"port": 22})
+            assert watcher._thread is not None and watcher._thread.is_alive()
+        assert watcher._thread is None and watcher._wake_fd is None
+
+    def test_snapshot_is_read_only(self, tmp_path):
+        path = tmp_path / "app.toml"
+        path.write_text("[db]\nhost = 'a'\n")
+        watcher = ConfigWatcher(str(path))
+        with pytest.raises(TypeError):
+            watcher.snapshot["db"]["host"] = "b"
+
+    def test_reload_only_when_changed(self, tmp_path):
+        path = tmp_path / "app.yaml"
+        path.write_text("port: 1\n")
+        watcher = ConfigWatcher(str(path))
+        assert watcher.reload() is False
+        path.write_text("port: 22\n")
+        assert watcher.reload() is True
+        assert watcher.snapshot == {"port": 22}
+
+    def test_errors_keep_previous_snapshot(self, tmp_path):
+        path = tmp_path / "app.toml"
+        path.write_text("port = 1\n")
+        errors = []
+        watcher = ConfigWatcher(str(path), on_error=errors.append)
+        path.write_text("port = = 2\n")
+        assert watcher.reload() is False
+        assert watcher.snapshot == {"port": 1}
+        assert isinstance(errors[0], tomllib.TOMLDecodeError)
+        assert watcher.last_error is errors[0]
+
+        def broken(snapshot):
+            raise RuntimeError("subscriber failed")
+
+        watcher.subscribe(broken)
+        path.write_text("port = 333\n")
+        assert watcher.reload() is True
+        assert watcher.snapshot == {"port": 333}
+        assert isinstance(errors[-1], RuntimeError)
+
+    def test_deleted_file_is_reported(self, tmp_path):
+        path = tmp_path / "app.toml"
+        path.write_text("port = 1\n")
+        watcher = ConfigWatcher(str(path))
+        path.unlink()
+        assert watcher.reload() is False
+        assert isinstance(watcher.last_error, FileNotFoundError)
+        assert watcher.snapshot == {"port": 1}
+
+
+class TestReadLayered:
+    def test_merges_files_in_order(self, tmp_path):
+        (tmp_path / "defaults.toml").write_text(
+            '[db]\nhost = "localhost"\nport = 5432\n'
+        )
+        (tmp_path / "local.yaml").write_text("db:\n  host: db.internal\n")
+        (tmp_path / ".env").write_text("DEBUG=1\n")
+        (tmp_path / "empty.yaml").write_text("")
+        files = [
+            str(tmp_path / name)
+            for name in ("defaults.toml", "local.yaml", "empty.yaml", ".env")
+        ]
+        for cached in (False, True):
+            config = read_layered(*files, cached=cached)
+            assert config.to_dict() == {
+                "db": {"host": "db.internal", "port": 5432},
+                "DEBUG": "1",
+            }
+
+    def test_missing_files(self, tmp_path):
+        (tmp_path / "a.toml").write_text("x = 1\n")
+        files = [str(tmp_path / "a.toml"), str(tmp_path / "missing.toml")]
+        with pytest.raises(FileNotFoundError):
+            read_layered(*files)
+        assert read_layered(*files, missing_ok=True).to_dict() == {"x": 1}
+
+    def test_non_mapping_file(self, tmp_path):
+        (tmp_path / "list.yaml").write_text("- 1\n- 2\n")
+        with pytest.raises(ValueError):
+            read_layered(str(tmp_path / "list.yaml"))
+
+
+class TestReadMany:
+    @staticmethod
+    def make_files(root):
+        (root / "sub").mkdir()
+        (root / "a.toml").write_text("x = 1\n")
+        (root / "b.yaml").write_text("y: [1, 2]\n")
+        (root / "sub" / "c.yaml").write_text("z: true\n")
+        (root / "bad.toml").write_text("x = \n")
+        (root / "notes.txt").write_text("hello\n")
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_loads_files_and_collects_errors(self, tmp_path, workers):
+        self.make_files(tmp_path)
+        result = read_many("**/*", str(tmp_path), workers=workers, chunksize=2)
+        assert result.data == {
+            "a.toml": {"x": 1},
+            "b.yaml": {"y": [1, 2]},
+            os.path.join("sub", "c.yaml"): {"z": True},
+        }
+        assert list(result.errors) == ["bad.toml", "notes.txt"]
+        assert isinstance(result.errors["bad.toml"], tomllib.TOMLDecodeError)
+        assert isinstance(result.errors["notes.txt"], ValueError)
+
+    def test_cached(self, tmp_path):
+        self.make_files(tmp_path)
+        config_cache.clear()
+        try:
+            first = read_many("*.yaml", str(tmp_path), workers=1, cached=True)
+            assert (config_cache.hits, config_cache.misses) == (0, 1)
+            first.data["b.yaml"]["y"].append(3)
+
+            second = read_many("*.yaml", str(tmp_path), workers=1, cached=True)
+            assert (config_cache.hits, config_cache.misses) == (1, 1)
+            assert second.data == {"b.yaml": {"y": [1, 2]}}
+
+            frozen = read_many(
+                "*.yaml", str(tmp_path), workers=1, cached=True, immutable=True
+            )
+            assert frozen.data["b.yaml"]["y"] == (1, 2)
+            assert read_cached(str(tmp_path / "b.yaml"), immutable=True) is (
+                frozen.data["b.yaml"]
+            )
+        finally:
+            config_cache.clear()
+
+    def test_invalid_chunksize(self, tmp_path):
+        with pytest.raises(ValueError):
+            read_many("*.toml", str(tmp_path), chunksize=0)
+
+
+class TestSnapshotCache:
+    def test_yaml_snapshot_reused_until_file_changes(self, tmp_path, monkeypatch):
+        path = tmp_path / "app.yaml"
+        path.write_text("a: [1, 2]\n")
+        cache_dir = tmp_path / "cache"
+        assert read_yaml(str(path), cache_dir=cache_dir) == {"a": [1, 2]}
+        assert len(list(cache_dir.glob("*.pickle"))) == 1
+
+        def fail(*args, **kwargs):
+            raise AssertionError("parsed again")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(yaml, "load", fail)
+            assert read_yaml(str(path), cache_dir=cache_dir) == {"a": [1, 2]}
+
+        path.write_text("a: [3]\n")
+        assert read_yaml(str(path), cache_dir=cache_dir) == {"a": [3]}
+
+    def test_loader_variants_have_separate_snapshots(self, tmp_path):
+        path = tmp_path / "app.yaml"
+        path.write_text("a: !!python/tuple [1, 2]\n")
+        cache_dir = tmp_path / "cache"
+        assert read_yaml(str(path), safe=False, cache_dir=cache_dir) == {"a": (1, 2)}
+        with pytest.raises(yaml.YAMLError):
+            read_yaml(str(path), cache_dir=cache_dir)
+
+    def test_toml_snapshot(self, tmp_path):
+        path = tmp_path / "app.toml"
+        path.write_text("[db]\nport = 5432\n")
+        cache_dir = tmp_path / "cache"
+        for _ in range(2):
+            assert read_toml(str(path), cache_dir=cache_dir) == {"db": {"port": 5432}}
+        assert len(list(cache_dir.glob("*.pickle"))) == 1
+
+        path.write_text("")
+        assert read_toml(str(path), cache_dir=cache_dir) is None
+
+    def test_corrupt_snapshot_is_replaced(self, tmp_path):
+        path = tmp_path / "app.toml"
+        path.write_text("x = 1\n")
+        cache_dir = tmp_path / "cache"
+        read_toml(str(path), cache_dir=cache_dir)
+        (snapshot,) = cache_dir.glob("*.pickle")
+        snapshot.write_bytes(snapshot.read_bytes()[:-5])
+        assert read_toml(str(path), cache_dir=cache_dir) == {"x": 1}
+        assert read_toml(str(path), cache_dir=cache_dir) == {"x": 1}
+
+    def test_unusable_cache_dir(self, tmp_path):
+        path = tmp_path / "app.toml"
+        path.write_text("x = 1\n")
+        not_a_dir = tmp_path / "file"
+        not_a_dir.write_text("")
+        assert read_toml(str(path), cache_dir=not_a_dir) == {"x": 1}
+
+
+class TestSchema:
+    SCHEMA = {
+        "name": str,
+        "debug?": bool,
+        "ratio": float,
+        "db": {"host": str, "port": int},
+        "servers": [{"host": str, "weight?": (int, None)}],
+        "meta?": Any,
+    }
+
+    def test_valid_data_is_returned(self):
+        validate = compile_schema(self.SCHEMA)
+        data = {
+            "name": "app",
+            "ratio": 1,
+            "db": {"host": "localhost", "port": 5432},
+            "servers": [{"host": "a", "weight": None}, {"host": "b", "weight": 2}],
+            "meta": object(),
+        }
+        assert validate(data) is data
+
+    def test_all_errors_reported_with_paths(self):
+        validate = compile_schema(self.SCHEMA)
+        with pytest.raises(SchemaError) as info:
+            validate(
+                {
+                    "name": 1,
+                    "debug": "yes",
+                    "ratio": True,
+                    "db": {"port": "5432", "user": "admin"},
+                    "servers": [{"host": "a"}, {"host": "b", "weight": 1.5}, "c"],
+                }
+            )
+        assert info.value.errors == [
+            ("name", "expected str, got int"),
+            ("debug", "expected bool, got str"),
+            ("ratio", "expected float, got bool"),
+            ("db.host", "missing required key"),
+            ("db.port", "expected int, got str"),
+            ("db.user", "unexpected key"),
+            ("servers[1].weight", "expected int or None, got float"),
+            ("servers[2]", "expected mapping, got str"),
+        ]
+        assert "db.port: expected int, got str" in str(info.value)
+
+    def test_allow_extra_and_read_only_views(self):
+        validate = compile_schema({"db": dict, "tags": [str]}, allow_extra=True)
+        data = {"db": MappingProxyType({}), "tags": ("a", "b"), "other": 1}
+        assert validate(data) is data
+        with pytest.raises(SchemaError, match="expected list, got str"):
+            validate({"db": {}, "tags": "a"})
+
+    def test_invalid_schema(self):
+        with pytest.raises(TypeError):
+            compile_schema({"tags": [str, int]})
+
+    def test_read_toml_and_yaml_with_schema(self, tmp_path):
+        validate = compile_schema({"db": {"port": int}})
+        (tmp_path / "good.toml").write_text("[db]\nport = 5432\n")
+        (tmp_path / "bad.yaml").write_text("db:\n  port: '5432'\n")
+        assert read_toml(str(tmp_path / "good.toml"), schema=validate) == {
+            "db": {"port": 5432}
+        }
+        with pytest.raises(SchemaError) as info:
+            read_yaml(str(tmp_path / "bad.yaml"), schema=validate)
+        assert info.value.errors == [("db.port", "expected int, got str")]
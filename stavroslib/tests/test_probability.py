@@ -1,14 +1,20 @@
 """Tests for probability utilities."""
 
+import math
+from fractions import Fraction
+
 import pytest
 
 from stavroslib.probability import (
+    book_overround,
     convert_dec_to_prob,
     convert_frac_to_dec,
     convert_frac_to_prob,
     convert_prob_to_dec,
     cumulative_binomial_probabilities,
     exact_binomial_probability,
+    remove_overround,
+    remove_overround_markets,
 )
 
 
@@ -144,3 +150,142 @@ class TestBinomialProbability:
         # P(X <= k) = P(X < k) + P(X = k)
         exact_k = exact_binomial_probability(n, k, p)
         assert abs((lt + exact_k) - lte) < 1e-10
+
+
+class TestExactMode:
+    """Test exact rational mode of probability functions."""
+
+    def test_odds_conversions_exact(self):
+        """Test odds conversions return unrounded fractions."""
+        assert convert_frac_to_prob(5, 2, exact=True) == Fraction(2, 7)
+        assert convert_frac_to_dec(5, 2, exact=True) == Fraction(7, 2)
+        assert convert_dec_to_prob(Fraction(3, 2), exact=True) == Fraction(2, 3)
+        assert convert_prob_to_dec(Fraction(2, 7), exact=True) == Fraction(7, 2)
+
+    def test_exact_roundtrip(self):
+        """Test exact conversions roundtrip without rounding error."""
+        prob = convert_frac_to_prob(13, 7, exact=True)
+        assert convert_prob_to_dec(prob, exact=True) == convert_frac_to_dec(
+            13, 7, exact=True
+        )
+
+    def test_exact_binomial_probability(self):
+        """Test exact binomial probability in rational arithmetic."""
+        prob = exact_binomial_probability(10, 5, Fraction(1, 2), exact=True)
+        assert prob == Fraction(252, 1024)
+        assert float(prob) == exact_binomial_probability(10, 5, 0.5)
+
+    def test_cumulative_exact_sums_to_one(self):
+        """Test exact cumulative probabilities are complementary."""
+        lt, lte, gt, gte = cumulative_binomial_probabilities(
+            20, 7, Fraction(1, 3), exact=True
+        )
+        assert lt + gte == 1
+        assert lte + gt == 1
+        assert lte - lt == exact_binomial_probability(20, 7, Fraction(1, 3), True)
+
+    def test_float_mode_matches_exact(self):
+        """Test float results agree with the exact results."""
+        floats = cumulative_binomial_probabilities(30, 12, 0.4)
+        exact = cumulative_binomial_probabilities(30, 12, 0.4, exact=True)
+        assert floats == pytest.approx([float(x) for x in exact], rel=1e-12)
+
+    def test_fallback_on_overflow(self):
+        """Test large n falls back to decimal arithmetic instead of overflowing."""
+        prob = exact_binomial_probability(2000, 1000, 0.5)
+        assert prob == pytest.approx(0.017839, rel=1e-4)
+
+    def test_fallback_on_underflow(self):
+        """Test underflowing powers fall back to decimal arithmetic."""
+        # 0.1**400 underflows to 0.0 although P(X = 400) is about 1e-138
+        prob = exact_binomial_probability(1000, 400, 0.1)
+        assert prob > 0.0
+        assert prob == float(exact_binomial_probability(1000, 400, 0.1, exact=True))
+
+    def test_fallback_on_subnormal(self):
+        """Test subnormal powers fall back to decimal arithmetic."""
+        # 0.1**320 is subnormal, so only a few significant bits are left
+        prob = exact_binomial_probability(1000, 320, 0.1)
+        expected = float(exact_binomial_probability(1000, 320, 0.1, exact=True))
+        assert prob == pytest.approx(expected, rel=1e-15)
+
+    def test_cumulative_large_n(self):
+        """Test float cumulative probabilities stay consistent for large n."""
+        lt, lte, gt, gte = cumulative_binomial_probabilities(5000, 1400, 0.3)
+        assert lt + gte == pytest.approx(1.0, rel=1e-15)
+        assert lte + gt == pytest.approx(1.0, rel=1e-15)
+        assert lte - lt == pytest.approx(
+            exact_binomial_probability(5000, 1400, 0.3), rel=1e-10
+        )
+
+
+class TestOverroundRemoval:
+    """Test market normalization functions."""
+
+    BOOKS = [[1.5, 3.0, 6.0], [1.2, 5.0, 15.0], [2.1, 3.4, 3.6], [1.9, 1.9]]
+
+    def test_book_overround(self):
+        """Test overround calculation."""
+        assert book_overround([2.0, 2.0]) == pytest.approx(0.0)
+        assert book_overround([1.5, 3.0, 6.0]) == pytest.approx(1 / 6)
+
+    @pytest.mark.parametrize("method", ["proportional", "shin", "power"])
+    def test_markets_sum_to_one(self, method):
+        """Test every normalized market sums to 1."""
+        for probs in remove_overround_markets(self.BOOKS, method):
+            assert sum(probs) == pytest.approx(1.0, abs=1e-12)
+            assert all(0 < p < 1 for p in probs)
+
+    def test_proportional(self):
+        """Test proportional normalization."""
+        probs = remove_overround([1.5, 3.0, 6.0])
+        assert probs == pytest.approx([4 / 7, 2 / 7, 1 / 7])
+
+    @pytest.mark.parametrize("method", ["shin", "power"])
+    def test_favourite_longshot_bias(self, method):
+        """Test shin and power shift probability towards the favourite."""
+        proportional = remove_overround([1.5, 3.0, 6.0])
+        adjusted = remove_overround([1.5, 3.0, 6.0], method)
+        assert adjusted[0] > proportional[0]
+        assert adjusted[2] < proportional[2]
+
+    def test_power_exponent(self):
+        """Test power method probabilities share a common exponent."""
+        odds = [1.5, 3.0, 6.0]
+        probs = remove_overround(odds, "power")
+        exponents = [math.log(p) / math.log(1 / o) for p, o in zip(probs, odds)]
+        assert exponents == pytest.approx([exponents[0]] * 3)
+
+    @pytest.mark.parametrize("method", ["proportional", "shin", "power"])
+    def test_fair_book_unchanged(self, method):
+        """Test a book without overround is left as is."""
+        assert remove_overround([2.5, 2.5, 5.0], method) == pytest.approx(
+            [0.4, 0.4, 0.2]
+        )
+
+    @pytest.mark.parametrize("method", ["shin", "power"])
+    def test_batch_matches_single(self, method):
+        """Test batched solving matches solving markets one at a time."""
+        batch = remove_overround_markets(self.BOOKS, method)
+        single = [remove_overround(book, method) for book in self.BOOKS]
+        assert batch == single
+
+    @pytest.mark.parametrize("method", ["shin", "power"])
+    def test_tolerance_is_passed_to_solver(self, method):
+        """Test a single market honours the solver tolerance and iterations."""
+        odds = [1.5, 3.0, 6.0]
+        precise = remove_overround(odds, method)
+        assert remove_overround(odds, method, tolerance=1e-3) != precise
+        assert remove_overround(odds, method, tolerance=1e-3) == pytest.approx(
+            precise, abs=1e-2
+        )
+        assert remove_overround(odds, method, max_iterations=1) != precise
+
+    def test_invalid_input(self):
+        """Test invalid methods and odds are rejected."""
+        with pytest.raises(ValueError):
+            remove_overround([1.5, 3.0], "magic")
+        with pytest.raises(ValueError):
+            remove_overround([1.0, 3.0])
+        with pytest.raises(ValueError):
+            remove_overround_markets([[]])
@@ -0,0 +1,115 @@
+"""Tests for Monte Carlo simulation utilities."""
+
+import statistics
+import subprocess
+import sys
+
+import pytest
+
+from stavroslib.simulation import (
+    SimulationSummary,
+    _summarize,
+    final_summary,
+    simulate_binomial,
+    simulate_portfolio,
+)
+
+
+def test_import_does_not_load_process_pool():
+    """Test the process pool is only imported when a simulation runs."""
+    code = "import sys, stavroslib.simulation; print('multiprocessing' in sys.modules)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "False"
+
+
+class TestSimulationSummary:
+    """Test summary statistics and merging."""
+
+    def test_summarize_matches_statistics(self):
+        """Test batch summary against the statistics module."""
+        values = [1.0, 4.0, 2.0, 8.0, 5.0]
+        summary = _summarize(values)
+        assert summary.count == 5
+        assert summary.mean == pytest.approx(statistics.mean(values))
+        assert summary.variance == pytest.approx(statistics.variance(values))
+        assert summary.minimum == 1.0
+        assert summary.maximum == 8.0
+
+    def test_merge_matches_pooled(self):
+        """Test merging two summaries equals summarizing pooled values."""
+        left, right = [1.0, 2.0, 3.0], [10.0, 20.0]
+        merged = _summarize(left).merge(_summarize(right))
+        pooled = _summarize(left + right)
+        assert merged.count == pooled.count
+        assert merged.mean == pytest.approx(pooled.mean)
+        assert merged.m2 == pytest.approx(pooled.m2)
+        assert merged.minimum == pooled.minimum
+        assert merged.maximum == pooled.maximum
+
+    def test_merge_with_empty(self):
+        """Test that empty summaries are the identity for merge."""
+        summary = _summarize([1.0, 2.0])
+        assert SimulationSummary().merge(summary) == summary
+        assert summary.merge(SimulationSummary()) == summary
+
+
+class TestSimulateBinomial:
+    """Test binomial simulation."""
+
+    def test_moments(self):
+        """Test simulated mean and variance approach n*p and n*p*(1-p)."""
+        summary = final_summary(simulate_binomial(20, 0.3, 200_000, seed=1))
+        assert summary.count == 200_000
+        assert summary.mean == pytest.approx(6.0, abs=0.05)
+        assert summary.variance == pytest.approx(4.2, abs=0.1)
+        assert 0 <= summary.minimum <= summary.maximum <= 20
+
+    def test_yields_running_summary_per_batch(self):
+        """Test one running summary is yielded per batch."""
+        summaries = list(simulate_binomial(10, 0.5, 2_500, batch_size=1_000, seed=3))
+        assert [s.count for s in summaries] == [1_000, 2_000, 2_500]
+
+    def test_seed_is_reproducible(self):
+        """Test the same seed gives the same results."""
+        first = final_summary(simulate_binomial(10, 0.5, 10_000, seed=7))
+        second = final_summary(simulate_binomial(10, 0.5, 10_000, seed=7))
+        assert first == second
+
+    def test_results_independent_of_workers(self):
+        """Test a seeded run gives the same result in a process pool."""
+        kwargs = {"batch_size": 2_000, "seed": 11}
+        serial = final_summary(simulate_binomial(10, 0.4, 10_000, **kwargs))
+        parallel = final_summary(
+            simulate_binomial(10, 0.4, 10_000, workers=2, **kwargs)
+        )
+        assert serial == parallel
+
+    def test_invalid_probability(self):
+        """Test that probabilities outside [0, 1] are rejected."""
+        with pytest.raises(ValueError):
+            simulate_binomial(10, 1.5, 100)
+
+    def test_no_simulations(self):
+        """Test that zero simulations give an empty summary."""
+        assert final_summary(simulate_binomial(10, 0.5, 0)) == SimulationSummary()
+
+
+class TestSimulatePortfolio:
+    """Test portfolio simulation."""
+
+    def test_expected_profit(self):
+        """Test simulated mean profit approaches the expected value."""
+        bets = [(2.0, 0.5, 10.0), (3.0, 0.4, 5.0)]
+        summary = final_summary(simulate_portfolio(bets, 200_000, seed=5))
+        assert summary.mean == pytest.approx(1.0, abs=0.1)
+        assert summary.minimum == -15.0
+        assert summary.maximum == 20.0
+
+    def test_certain_outcomes(self):
+        """Test bets that always win or always lose."""
+        bets = [(2.5, 1.0, 4.0), (10.0, 0.0, 1.0)]
+        summary = final_summary(simulate_portfolio(bets, 1_000, seed=0))
+        assert summary.mean == 5.0
+        assert summary.variance == 0.0
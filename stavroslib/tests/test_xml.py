@@ -1,9 +1,38 @@
 """Tests for XML utilities"""
 
+import io
+import subprocess
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
+from lxml import etree
 from lxml.etree import XMLSyntaxError
 
-from stavroslib.xml import remove_namespace, xml_to_dict
+from stavroslib.xml import (
+    _etree_to_dict,
+    _parser,
+    compile_xpath,
+    dict_to_xml,
+    extract_records,
+    iter_xml_records,
+    remove_namespace,
+    types_from_xsd,
+    write_xml_records,
+    xml_to_dict,
+    xml_to_dict_batch,
+    xpath_query,
+)
+
+
+def test_import_does_not_load_process_pool():
+    code = "import sys, stavroslib.xml; print('multiprocessing' in sys.modules)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "False"
 
 
 class TestXmlToDict:
@@ -71,6 +100,277 @@ class TestXmlToDict:
         result = xml_to_dict(xml)
         assert result == {"root": "value with spaces"}
 
+    def test_interleaved_repeated_elements(self):
+        xml = "<root><a>1</a><b>x</b><a>2</a><a>3</a></root>"
+        result = xml_to_dict(xml)
+        assert result == {"root": {"a": ["1", "2", "3"], "b": "x"}}
+
+    def test_whitespace_only_leaf(self):
+        xml = "<root><a> </a><b x='1'> </b></root>"
+        result = xml_to_dict(xml)
+        assert result == {"root": {"a": "", "b": {"@x": "1"}}}
+
+    def test_deep_nesting_beyond_recursion_limit(self):
+        root = etree.Element("level")
+        element = root
+        for _ in range(5000):
+            element = etree.SubElement(element, "level")
+        element.text = "bottom"
+        result = _etree_to_dict(root)
+        for _ in range(5001):
+            result = result["level"]
+        assert result == "bottom"
+
+    @pytest.mark.parametrize("convert", [bytes, bytearray, memoryview])
+    def test_bytes_input(self, convert):
+        xml = convert('<root id="1"><item>värde</item></root>'.encode("utf-8"))
+        result = xml_to_dict(xml)
+        assert result == {"root": {"@id": "1", "item": "värde"}}
+
+    def test_bytes_honour_declared_encoding(self):
+        xml = '<?xml version="1.0" encoding="ISO-8859-1"?><root>café</root>'
+        assert xml_to_dict(xml.encode("latin-1")) == {"root": "café"}
+
+    def test_str_ignores_declared_encoding(self):
+        xml = '<?xml version="1.0" encoding="ISO-8859-1"?><root>café</root>'
+        assert xml_to_dict(xml) == {"root": "café"}
+
+    def test_file_path_input(self, tmp_path):
+        path = tmp_path / "doc.xml"
+        path.write_bytes(b"<root><item>value</item></root>")
+        assert xml_to_dict(path) == {"root": {"item": "value"}}
+
+    def test_file_object_input(self, tmp_path):
+        path = tmp_path / "doc.xml"
+        path.write_bytes(b"<root><item>value</item></root>")
+        with open(path, "rb") as f:
+            assert xml_to_dict(f) == {"root": {"item": "value"}}
+
+
+class TestTypedConversion:
+    xml = (
+        '<feed updated="2024-01-15"><item id="1"><price>1.5</price>'
+        "<tag>a</tag></item>"
+        '<item id="2"><price currency="EUR">2.25</price><tag>b</tag><tag>c</tag>'
+        "<empty/><blank> </blank></item></feed>"
+    )
+
+    def test_types(self):
+        types = {"price": float, "@id": int, "@updated": date.fromisoformat}
+        result = xml_to_dict(self.xml, types=types)["feed"]
+        assert result["@updated"] == date(2024, 1, 15)
+        first, second = result["item"]
+        assert first["@id"] == 1 and first["price"] == 1.5
+        assert second["price"] == {"@currency": "EUR", "#text": 2.25}
+        assert second["empty"] is None and second["blank"] == ""
+
+    def test_types_on_branch_text_and_root(self):
+        assert xml_to_dict("<n>7</n>", types={"n": int}) == {"n": 7}
+        result = xml_to_dict("<n>7<x/></n>", types={"n": int})
+        assert result == {"n": {"x": None, "#text": 7}}
+
+    def test_force_list(self):
+        result = xml_to_dict(self.xml, force_list=["tag", "item"])["feed"]
+        assert [item["tag"] for item in result["item"]] == [["a"], ["b", "c"]]
+        assert xml_to_dict("<r><item/></r>", force_list={"item"}) == {
+            "r": {"item": [None]}
+        }
+
+    def test_iter_xml_records(self, tmp_path):
+        path = tmp_path / "feed.xml"
+        path.write_text(self.xml)
+        records = iter_xml_records(path, "item", types={"@id": int}, force_list=["tag"])
+        assert [r["item"]["@id"] for r in records] == [1, 2]
+        records = iter_xml_records(path, "item", force_list=["tag"])
+        assert next(records)["item"]["tag"] == ["a"]
+
+    def test_converter_errors_propagate(self):
+        with pytest.raises(ValueError):
+            xml_to_dict("<n>x</n>", types={"n": int})
+
+    def test_types_from_xsd(self):
+        xsd = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+          <xs:element name="item"><xs:complexType><xs:sequence>
+            <xs:element name="price" type="xs:decimal"/>
+            <xs:element name="live" type="xs:boolean"/>
+            <xs:element name="name" type="xs:string"/>
+            <xs:element name="at" type="xs:dateTime"/>
+            <xs:element name="count">
+              <xs:simpleType><xs:restriction base="xs:unsignedInt">
+                <xs:maxInclusive value="10"/>
+              </xs:restriction></xs:simpleType>
+            </xs:element>
+          </xs:sequence><xs:attribute name="id" type="xs:int"/></xs:complexType>
+          </xs:element></xs:schema>"""
+        types = types_from_xsd(xsd)
+        assert set(types) == {"price", "live", "at", "count", "@id"}
+        xml = (
+            '<item id="3"><price>9.99</price><live>true</live><name>x</name>'
+            "<at>2024-01-15T10:30:00</at><count>4</count></item>"
+        )
+        assert xml_to_dict(xml, types=types) == {
+            "item": {
+                "@id": 3,
+                "price": Decimal("9.99"),
+                "live": True,
+                "name": "x",
+                "at": datetime(2024, 1, 15, 10, 30),
+                "count": 4,
+            }
+        }
+        with pytest.raises(ValueError):
+            types["live"]("yes")
+
+
+class TestUntrustedInput:
+    billion_laughs = (
+        '<?xml version="1.0"?><!DOCTYPE lolz ['
+        '<!ENTITY lol "lol">'
+        '<!ENTITY lol2 "&lol;&lol;&lol;&lol;&lol;&lol;&lol;&lol;&lol;&lol;">'
+        '<!ENTITY lol3 "&lol2;&lol2;&lol2;&lol2;&lol2;&lol2;&lol2;&lol2;">'
+        "]><lolz>&lol3;</lolz>"
+    )
+
+    def test_entities_are_not_expanded(self):
+        assert xml_to_dict(self.billion_laughs) == {"lolz": "&lol3;"}
+
+    def test_declared_entities_stay_references(self, tmp_path):
+        xml = (
+            '<!DOCTYPE l [<!ENTITY b "bee">]>'
+            '<l a="1">x &b; y<c/><d>&b;&b;</d><e>&b;</e></l>'
+        )
+        expected = {"c": None, "d": "&b;&b;", "e": "&b;", "@a": "1", "#text": "x &b; y"}
+        assert xml_to_dict(xml) == {"l": expected}
+        assert list(xml_to_dict_batch([xml], workers=1)) == [{"l": expected}]
+        path = tmp_path / "doc.xml"
+        path.write_text(xml)
+        assert list(iter_xml_records(path, tag="d")) == [{"d": "&b;&b;"}]
+
+    def test_external_entity_is_not_loaded(self, tmp_path):
+        secret = tmp_path / "secret.txt"
+        secret.write_text("top secret")
+        xml = (
+            f'<!DOCTYPE r [<!ENTITY x SYSTEM "{secret.as_uri()}">]>' "<r><a>&x;</a></r>"
+        )
+        assert "top secret" not in str(xml_to_dict(xml))
+        path = tmp_path / "doc.xml"
+        path.write_text(xml)
+        assert "top secret" not in str(list(iter_xml_records(path, tag="a")))
+
+    def test_max_size(self, tmp_path):
+        xml = "<root>" + "x" * 100 + "</root>"
+        path = tmp_path / "doc.xml"
+        path.write_text(xml)
+        for source in [xml, xml.encode(), path]:
+            with pytest.raises(ValueError, match="max_size"):
+                xml_to_dict(source, max_size=50)
+            assert xml_to_dict(source, max_size=200) == {"root": "x" * 100}
+        with pytest.raises(ValueError, match="max_size"):
+            xml_to_dict(io.BytesIO(xml.encode()), max_size=50)
+        assert xml_to_dict(io.BytesIO(xml.encode()), max_size=200)
+
+    def test_max_depth(self):
+        xml = "<a><b><c><d>x</d></c></b></a>"
+        assert xml_to_dict(xml, max_depth=4) == {"a": {"b": {"c": {"d": "x"}}}}
+        with pytest.raises(ValueError, match="max_depth"):
+            xml_to_dict(xml, max_depth=3)
+        with pytest.raises(ValueError, match="max_depth"):
+            xml_to_dict("<a><b/></a>", max_depth=1)
+        assert xml_to_dict("<a/>", max_depth=1) == {"a": None}
+
+    def test_parser_is_reused_per_thread(self):
+        assert _parser() is _parser()
+        assert _parser(huge_tree=True) is not _parser()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(_parser).result() is not _parser()
+
+
+class TestXmlToDictBatch:
+    documents = [f"<doc><n>{i}</n></doc>" for i in range(25)]
+
+    def test_in_process_matches_xml_to_dict(self):
+        results = list(xml_to_dict_batch(self.documents, workers=1, chunksize=4))
+        assert results == [xml_to_dict(doc) for doc in self.documents]
+
+    def test_process_pool_keeps_order(self, tmp_path):
+        paths = []
+        for i, doc in enumerate(self.documents):
+            path = tmp_path / f"{i}.xml"
+            path.write_text(doc)
+            paths.append(path)
+        results = list(xml_to_dict_batch(paths, workers=2, chunksize=3))
+        assert results == [{"doc": {"n": str(i)}} for i in range(25)]
+
+    def test_unordered_returns_every_result(self):
+        documents = [doc.encode() for doc in self.documents]
+        results = xml_to_dict_batch(documents, workers=2, chunksize=2, ordered=False)
+        assert sorted(int(r["doc"]["n"]) for r in results) == list(range(25))
+
+    def test_memoryview_input(self):
+        documents = [memoryview(b"<root>a</root>")]
+        assert list(xml_to_dict_batch(documents, workers=2)) == [{"root": "a"}]
+
+    def test_malformed_document_raises(self):
+        documents = ["<root/>"] * 5 + ["<root>"]
+        with pytest.raises(ValueError, match="document 5 is malformed"):
+            list(xml_to_dict_batch(documents, workers=2, chunksize=2))
+        with pytest.raises(ValueError, match="document 5 is malformed"):
+            list(xml_to_dict_batch(documents, workers=1, chunksize=2))
+
+    def test_invalid_chunksize(self):
+        # Raised by the call itself, before any result is requested
+        with pytest.raises(ValueError, match="chunksize"):
+            xml_to_dict_batch(self.documents, chunksize=0)
+
+
+class TestIterXmlRecords:
+    FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+    <feed>
+        <title>Feed</title>
+        <item id="1"><name>One</name></item>
+        <item id="2"><name>Two</name><tag>a</tag><tag>b</tag></item>
+        <other>skip</other>
+        <item id="3"/>
+    </feed>"""
+
+    def test_yields_records_in_order(self):
+        records = list(iter_xml_records(io.BytesIO(self.FEED), tag="item"))
+        assert records == [
+            {"item": {"@id": "1", "name": "One"}},
+            {"item": {"@id": "2", "name": "Two", "tag": ["a", "b"]}},
+            {"item": {"@id": "3"}},
+        ]
+
+    def test_matches_xml_to_dict(self):
+        full = xml_to_dict(self.FEED.decode("utf-8").split("?>", 1)[1])
+        records = [r["item"] for r in iter_xml_records(io.BytesIO(self.FEED), "item")]
+        assert records == full["feed"]["item"]
+
+    def test_file_path(self, tmp_path):
+        path = tmp_path / "feed.xml"
+        path.write_bytes(self.FEED)
+        assert len(list(iter_xml_records(str(path), tag="item"))) == 3
+        assert len(list(iter_xml_records(path, tag="item"))) == 3
+
+    def test_many_records(self):
+        items = "".join(f"<item><v>{i}</v></item>" for i in range(1000))
+        stream = io.BytesIO(f"<feed>{items}</feed>".encode("utf-8"))
+        records = list(iter_xml_records(stream, tag="item"))
+        assert len(records) == 1000
+        assert records[-1] == {"item": {"v": "999"}}
+
+    def test_namespaced_tag(self):
+        xml = b'<feed xmlns="http://example.com"><item>1</item><item>2</item></feed>'
+        records = list(iter_xml_records(io.BytesIO(xml), "{http://example.com}item"))
+        assert records == [
+            {"{http://example.com}item": "1"},
+            {"{http://example.com}item": "2"},
+        ]
+
+    def test_invalid_xml_raises_error(self):
+        with pytest.raises(XMLSyntaxError):
+            list(iter_xml_records(io.BytesIO(b"<feed><item>"), "item"))
+
 
 class TestRemoveNamespace:
     def test_simple_namespace(self):
@@ -115,3 +415,160 @@ class TestRemoveNamespace:
         xml = '<root xmlns="http://example.com"><a><b><c>deep</c></b></a></root>'
         result = remove_namespace(xml)
         assert "<a><b><c>deep</c></b></a>" in result
+
+    @pytest.mark.parametrize(
+        "xml",
+        [
+            '<root xmlns="http://example.com"><item>value</item></root>',
+            '<root xmlns:c="http://c.com"><c:item c:a="1" b="2">v</c:item></root>',
+            '<root xmlns="http://e.com">t<a><!-- c --><b x="1">d</b></a>tail</root>',
+            "<root><item>value</item></root>",
+        ],
+    )
+    def test_rewrite_matches_xslt(self, xml):
+        assert remove_namespace(xml, method="rewrite") == remove_namespace(xml)
+
+    def test_namespaced_attributes_rewrite(self):
+        xml = '<root xmlns:c="http://c.com"><item c:attr="test">v</item></root>'
+        result = remove_namespace(xml, method="rewrite")
+        assert result == '<root><item attr="test">v</item></root>'
+
+    def test_bytes_and_path_input(self, tmp_path):
+        xml = b'<root xmlns="http://example.com"><item>value</item></root>'
+        path = tmp_path / "doc.xml"
+        path.write_bytes(xml)
+        expected = "<root><item>value</item></root>"
+        assert remove_namespace(xml) == expected
+        assert remove_namespace(memoryview(xml), method="rewrite") == expected
+        assert remove_namespace(path) == expected
+
+    def test_unknown_method(self):
+        with pytest.raises(ValueError):
+            remove_namespace("<root/>", method="magic")
+
+    def test_threads(self):
+        xml = '<root xmlns="http://example.com"><item>value</item></root>'
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(remove_namespace, [xml] * 20))
+        assert results == [remove_namespace(xml)] * 20
+
+
+class TestDictToXml:
+    @pytest.mark.parametrize(
+        "xml",
+        [
+            "<root><item>value</item></root>",
+            '<root id="1"><a>1</a><a>2</a><b x="y">t</b><empty/></root>',
+            '<root id="1">text<child>value</child></root>',
+            "<r><a><b><c>deep</c></b></a></r>",
+            "<r><!-- note --><a>1</a><!-- more --><b><!-- inner --></b></r>",
+        ],
+    )
+    def test_roundtrip(self, xml):
+        data = xml_to_dict(xml)
+        assert xml_to_dict(dict_to_xml(data)) == data
+
+    def test_simple(self):
+        data = {"root": {"@id": "1", "item": ["a", "b"]}}
+        result = dict_to_xml(data)
+        assert result == '<root id="1"><item>a</item><item>b</item></root>'
+
+    def test_escaping(self):
+        result = dict_to_xml({"root": {"@q": 'a"b', "v": "<&>"}})
+        assert result == '<root q="a&quot;b"><v>&lt;&amp;&gt;</v></root>'
+        assert xml_to_dict(result) == {"root": {"@q": 'a"b', "v": "<&>"}}
+
+    def test_value_conversion(self):
+        data = {"root": {"flag": True, "n": 3, "day": date(2024, 1, 15)}}
+        result = dict_to_xml(data)
+        assert result == ("<root><flag>true</flag><n>3</n><day>2024-01-15</day></root>")
+
+    def test_comments_and_processing_instructions(self):
+        data = xml_to_dict("<r><!-- c --><?target x?><a>1</a></r>")
+        assert dict_to_xml(data) == "<r><!--c--><a>1</a></r>"
+        with pytest.raises(ValueError):
+            dict_to_xml({"r": {"": 1}})
+
+    def test_invalid_root(self):
+        with pytest.raises(ValueError):
+            dict_to_xml({"a": 1, "b": 2})
+        with pytest.raises(ValueError):
+            dict_to_xml({"a": [1, 2]})
+
+
+class TestWriteXmlRecords:
+    def test_stream_roundtrip(self, tmp_path):
+        path = tmp_path / "out.xml"
+        records = ({"item": {"@id": str(i), "name": f"n{i}"}} for i in range(100))
+        assert write_xml_records(path, records, root_tag="feed") == 100
+        back = list(iter_xml_records(path, tag="item"))
+        assert back[0] == {"item": {"@id": "0", "name": "n0"}}
+        assert len(back) == 100
+
+    def test_binary_stream_and_root_attributes(self):
+        out = io.BytesIO()
+        write_xml_records(
+            out, [{"item": "a"}, {"item": ["b", "c"]}], "feed", {"v": "1"}
+        )
+        assert xml_to_dict(out.getvalue()) == {
+            "feed": {"item": ["a", "b", "c"], "@v": "1"}
+        }
+        assert out.getvalue().startswith(b"<?xml")
+
+
+class TestXPath:
+    FEED = (
+        b'<feed xmlns:m="urn:m">'
+        b'<item id="1"><title> A </title><m:price>3</m:price><tag>x</tag><tag>y</tag></item>'
+        b'<item id="2"><title>B</title></item>'
+        b"</feed>"
+    )
+
+    def test_compile_xpath_is_cached(self):
+        first = compile_xpath("//item/@id")
+        assert compile_xpath("//item/@id") is first
+        assert compile_xpath("//m:price", {"m": "urn:m"}) is compile_xpath(
+            "//m:price", {"m": "urn:m"}
+        )
+        assert compile_xpath("//m:price", {"m": "urn:other"}) is not compile_xpath(
+            "//m:price", {"m": "urn:m"}
+        )
+
+    def test_compile_xpath_evicts_least_recently_used(self, monkeypatch):
+        monkeypatch.setattr("stavroslib.xml._XPATH_CACHE_SIZE", 2)
+
+        def run():
+            a, b = compile_xpath("//a"), compile_xpath("//b")
+            assert compile_xpath("//a") is a  # now the most recently used
+            compile_xpath("//c")  # evicts //b
+            return compile_xpath("//a") is a, compile_xpath("//b") is b
+
+        # A new thread starts with an empty cache
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(run).result() == (True, False)
+
+    def test_xpath_query_values(self):
+        assert xpath_query(self.FEED, "//item/@id") == ["1", "2"]
+        assert xpath_query(self.FEED, "//item[@id='2']/title") == "B"
+        assert xpath_query(self.FEED, "//missing") is None
+        assert xpath_query(self.FEED, "count(//item)") == 2.0
+        assert xpath_query(self.FEED, "//m:price/text()", {"m": "urn:m"}) == "3"
+
+    def test_xpath_results_are_plain_strings(self):
+        value = xpath_query(self.FEED, "//item[1]/@id")
+        assert type(value) is str
+
+    def test_extract_records(self):
+        fields = {"id": "@id", "title": "title", "price": "m:price", "tags": "tag"}
+        rows = list(
+            extract_records(io.BytesIO(self.FEED), "item", fields, {"m": "urn:m"})
+        )
+        assert rows == [
+            {"id": "1", "title": "A", "price": "3", "tags": ["x", "y"]},
+            {"id": "2", "title": "B", "price": None, "tags": None},
+        ]
+
+    def test_extract_records_keeps_entity_references(self):
+        feed = b'<!DOCTYPE feed [<!ENTITY b "bee">]><feed><item>x &b; y</item></feed>'
+        rows = list(extract_records(io.BytesIO(feed), "item", {"text": "text()"}))
+        assert rows == [{"text": "x &b; y"}]